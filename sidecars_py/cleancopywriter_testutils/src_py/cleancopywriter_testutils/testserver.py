@@ -1,11 +1,17 @@
 from __future__ import annotations
 
-from contextvars import ContextVar
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from hashlib import blake2b
+from html import escape as html_escape
 from inspect import cleandoc
+from os import cpu_count
+from os import environ
 from pathlib import Path
 from typing import cast
 
 import anyio
+import anyio.to_thread
 import uvicorn
 from cleancopy.ast import ASTNode
 from cleancopy.ast import InlineNodeInfo
@@ -19,73 +25,154 @@ from docnote_extract import gather as gather_docnotes
 from docnote_extract.summaries import ModuleSummary
 from docnote_extract.summaries import SummaryMetadataProtocol
 from fastapi import FastAPI
+from fastapi import Request
 from fastapi.responses import HTMLResponse
 from fastapi.responses import Response
 from templatey.environments import RenderEnvironment
 from templatey.prebaked.loaders import InlineStringTemplateLoader
 
 from cleancopywriter.html.documents import HtmlDocumentCollection
-from cleancopywriter.html.generic_templates import HtmlAttr
-from cleancopywriter.html.generic_templates import HtmlGenericElement
-from cleancopywriter.html.generic_templates import PlaintextTemplate
 
 REPO_ROOT = Path(__file__).parent.parent.parent.parent.parent
 CSS_ROOT = REPO_ROOT / 'src_css'
 APP_HOST = 'localhost'
 APP_PORT = 7887
 ANYIO_BACKEND = 'asyncio'
-app = FastAPI()
-
-_DOC_COLL: ContextVar[HtmlDocumentCollection] = ContextVar('_DOC_COLL')
-
+# Note: because we drive uvicorn via ``server.serve()`` from within anyio,
+# uvicorn's own ``loop`` setting is ignored; uvloop has to be requested
+# from anyio instead.
+ANYIO_BACKEND_OPTIONS = {'use_uvloop': True}
+# Set this to a number of worker processes, or to ``auto`` for
+# ``2 * cpu_count + 1``. Each worker builds its own document collection on
+# startup, so this trades startup time (and memory) for parallel renders.
+WORKERS_ENVVAR = 'CCW_TESTSERVER_WORKERS'
+APP_IMPORT_STR = 'cleancopywriter_testutils.testserver:app'
+
+# The environment caches parsed templates, so sharing a single instance
+# across all requests means we only ever parse each template once.
+_RENDER_ENV = RenderEnvironment(
+    InlineStringTemplateLoader(),
+    strict_interpolation_validation=False)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """The stylesheet doesn't change while the server is running, so
+    we read it exactly once at startup and then serve every request
+    from memory.
+
+    If nothing has set ``app.state.doc_coll`` before startup (which is
+    the case for every worker process in multi-worker mode), this also
+    builds the document collection.
+    """
+    if getattr(app.state, 'doc_coll', None) is None:
+        # Parsing and templatifying every docstring is entirely CPU-bound,
+        # so we don't want to block the event loop while doing it.
+        app.state.doc_coll = await anyio.to_thread.run_sync(_build_doc_coll)
 
-@app.get('/cleancopywriter.css')
-async def get_css():
     path = anyio.Path(CSS_ROOT) / 'cleancopywriter.css'
-    text = await path.read_text('utf-8')
-    return Response(content=text, media_type='text/css')
+    css_bytes = await path.read_bytes()
+    css_etag = f'"{blake2b(css_bytes, digest_size=16).hexdigest()}"'
+
+    app.state.css_etag = css_etag
+    app.state.css_response = Response(
+        content=css_bytes,
+        media_type='text/css',
+        # Since this is a dev server, we always want the browser to check
+        # back in with us (so that a restart picks up any css changes), but
+        # with the etag, that's a cheap 304.
+        headers={'Cache-Control': 'no-cache', 'ETag': css_etag})
+    # This gets populated lazily by list_docs; see there for details.
+    app.state.index_cache = None
+    yield
+
+
+# This isn't an API, so there's no point in generating (or serving) any of
+# the openapi schema or docs.
+app = FastAPI(
+    lifespan=lifespan,
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None)
+
+
+@app.get(
+    '/cleancopywriter.css', response_class=Response, include_in_schema=False)
+async def get_css(request: Request):
+    css_etag = request.app.state.css_etag
+    if request.headers.get('if-none-match') == css_etag:
+        return Response(status_code=304, headers={'ETag': css_etag})
+
+    return request.app.state.css_response
+
+
+@app.get('/ccw_docs', response_class=HTMLResponse, include_in_schema=False)
+async def list_docs(request: Request):
+    doc_coll: HtmlDocumentCollection = request.app.state.doc_coll
+
+    # Document collections are append-only (there's no way to remove a
+    # document, and adding a duplicate ID is an error), so the number of
+    # documents is sufficient to know if the cached index is stale.
+    index_cache: tuple[int, HTMLResponse] | None = (
+        request.app.state.index_cache)
+    if index_cache is not None:
+        cached_len, cached_response = index_cache
+        if cached_len == len(doc_coll):
+            return cached_response
+
+    # This is just a flat list of links, so it's much cheaper to build the
+    # HTML directly than it is to go through the template machinery.
+    items = ''.join(
+        f'<li><a href="/ccw_docs/{escaped_id}">{escaped_id}</a></li>'
+        for escaped_id in map(html_escape, sorted(doc_coll)))
+    response = _html_quickfmt('list docs', f'<ul>{items}</ul>')
+    request.app.state.index_cache = (len(doc_coll), response)
+    return response
+
+
+@app.get(
+    '/ccw_docs/{doc_id}', response_class=HTMLResponse, include_in_schema=False)
+async def get_doc(request: Request, doc_id: str):
+    doc_coll: HtmlDocumentCollection = request.app.state.doc_coll
 
+    doc = doc_coll.get(doc_id)
+    if doc is None:
+        return HTMLResponse('Not found', 404)
 
-@app.get('/ccw_docs')
-async def list_docs():
-    doc_coll = _DOC_COLL.get()
-
-    items = []
-    for id_ in sorted(doc_coll):
-        items.append(HtmlGenericElement(
-            tag='li',
-            body=[HtmlGenericElement(
-                tag='a',
-                attrs=[HtmlAttr(key='href', value=f'/ccw_docs/{id_}')],
-                body=[PlaintextTemplate(text=id_)])]))
-    body = HtmlGenericElement(
-        tag='ul',
-        body=items)
-
-    render_env = RenderEnvironment(
-        InlineStringTemplateLoader(),
-        strict_interpolation_validation=False)
+    # The testserver collection always prerenders, but we don't control the
+    # collection passed to ``main``, so we need a fallback here.
+    if doc.prerendered_html is None:
+        rendered_body = await _RENDER_ENV.render_async(
+            doc.intermediate_representation)
+    else:
+        rendered_body = doc.prerendered_html
 
-    return _html_quickfmt(
-        'list docs',
-        await render_env.render_async(body))
+    return _html_quickfmt(doc_id, rendered_body)
 
 
-@app.get('/ccw_docs/{doc_id}')
-async def get_doc(doc_id: str):
-    doc_coll = _DOC_COLL.get()
+_PAGE_TEMPLATE = cleandoc('''
+    <!doctype html>
+    <html>
+    <head>
+        <title>cleancopywriter | {title}</title>
+        <link rel="stylesheet" href="/cleancopywriter.css">
+    </head>
+    <body>
+    {rendered_body}
+    </body>
+    </html>
+    ''')
 
-    doc = doc_coll.get(doc_id)
-    if doc is None:
-        return HTMLResponse('Not found', 404)
 
-    render_env = RenderEnvironment(
-        InlineStringTemplateLoader(),
-        strict_interpolation_validation=False)
-
-    return _html_quickfmt(
-        doc_id,
-        await render_env.render_async(doc.intermediate_representation))
+# The page wrapper never changes, so we encode it once and split it around
+# its two interpolation points. Each response then only has to encode the
+# (escaped) title and the body, and starlette passes the resulting bytes
+# through without re-encoding them.
+_PAGE_HEAD, _PAGE_MID, _PAGE_TAIL = (
+    _PAGE_TEMPLATE
+    .replace('{rendered_body}', '{title}')
+    .encode('utf-8')
+    .split(b'{title}'))
 
 
 def _html_quickfmt(title: str, rendered_body: str) -> HTMLResponse:
@@ -93,18 +180,12 @@ def _html_quickfmt(title: str, rendered_body: str) -> HTMLResponse:
     a rendered body in an extremely basic HTML page as suitable for
     fastAPI.
     """
-    return HTMLResponse(cleandoc(f'''
-        <!doctype html>
-        <html>
-        <head>
-            <title>cleancopywriter | {title}</title>
-            <link rel="stylesheet" href="/cleancopywriter.css">
-        </head>
-        <body>
-            {rendered_body}
-        </body>
-        </html>
-        '''))
+    return HTMLResponse(b''.join((
+        _PAGE_HEAD,
+        html_escape(title).encode('utf-8'),
+        _PAGE_MID,
+        rendered_body.encode('utf-8'),
+        _PAGE_TAIL)))
 
 
 def _make_id(summary: ModuleSummary) -> str:
@@ -172,10 +253,11 @@ def _transform_clc_node(
         content=[node])
 
 
-def entrypoint():
+def _build_doc_coll() -> HtmlDocumentCollection:
     doc_coll = HtmlDocumentCollection(
         target_resolver=_resolve_link_target,
-        transformers=[_transform_clc_node])
+        transformers=[_transform_clc_node],
+        render_env=_RENDER_ENV)
     finnr_docnotes = gather_docnotes(['finnr'])
     package_summary_tree = finnr_docnotes.summaries['finnr']
     for summary_tree_node in package_summary_tree.flatten():
@@ -184,19 +266,71 @@ def entrypoint():
                 _make_id(summary_tree_node.module_summary),
                 docnote_src=summary_tree_node)
 
-    anyio.run(main, doc_coll, backend=ANYIO_BACKEND)
+    return doc_coll
+
+
+def _get_worker_count() -> int:
+    raw_workers = environ.get(WORKERS_ENVVAR, '1')
+    if raw_workers == 'auto':
+        return (cpu_count() or 1) * 2 + 1
+
+    try:
+        workers = int(raw_workers)
+    except ValueError as exc:
+        raise ValueError(
+            f'{WORKERS_ENVVAR} must be an integer or ``auto``',
+            raw_workers) from exc
 
+    if workers < 1:
+        raise ValueError(
+            f'{WORKERS_ENVVAR} must be at least 1', raw_workers)
 
-async def main(doc_coll: HtmlDocumentCollection):
+    return workers
+
+
+def entrypoint():
+    workers = _get_worker_count()
+    # In both cases, the doc collection gets built by the lifespan, off of
+    # the event loop thread.
+    if workers == 1:
+        anyio.run(
+            main,
+            backend=ANYIO_BACKEND,
+            backend_options=ANYIO_BACKEND_OPTIONS)
+
+    # Multiple workers means uvicorn needs to spawn the processes itself,
+    # which requires an import string instead of the app object.
+    else:
+        uvicorn.run(
+            APP_IMPORT_STR,
+            host=APP_HOST,
+            port=APP_PORT,
+            log_level="info",
+            loop='uvloop',
+            http='httptools',
+            access_log=False,
+            workers=workers)
+
+
+async def main(doc_coll: HtmlDocumentCollection | None = None):
+    """Runs the testserver in the current event loop. If no doc
+    collection is passed, the default (finnr) collection is built during
+    startup.
+    """
     config = uvicorn.Config(
-        app, host=APP_HOST, port=APP_PORT, log_level="info")
+        app,
+        host=APP_HOST,
+        port=APP_PORT,
+        log_level="info",
+        http='httptools',
+        access_log=False)
     server = uvicorn.Server(config)
 
-    ctx_token = _DOC_COLL.set(doc_coll)
+    app.state.doc_coll = doc_coll
     try:
         await server.serve()
     finally:
-        _DOC_COLL.reset(ctx_token)
+        app.state.doc_coll = None
 
 
 if __name__ == '__main__':
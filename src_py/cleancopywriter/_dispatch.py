@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+
+def resolve_by_mro[V, D](
+        lookup: dict[type, V],
+        type_: type,
+        default: D
+        ) -> V | D:
+    """Our type-keyed dispatch tables only contain the exact types, so
+    for subclasses, we need to search the MRO. Any match is memoized
+    back into the lookup, so that this only happens once per subclass.
+    If nothing in the MRO matches, returns the default (which is **not**
+    memoized).
+    """
+    for parent_type in type_.__mro__[1:]:
+        if parent_type in lookup:
+            value = lookup[type_] = lookup[parent_type]
+            return value
+
+    return default
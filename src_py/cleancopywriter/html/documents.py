@@ -1,12 +1,13 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from collections.abc import Callable
 from collections.abc import Iterator
 from collections.abc import Mapping
 from collections.abc import Sequence
 from dataclasses import dataclass
 from dataclasses import field
-from functools import singledispatch
+from hashlib import blake2b
 from typing import Annotated
 from typing import Any
 from typing import cast
@@ -30,6 +31,7 @@ from templatey._types import TemplateParamsInstance
 from templatey.environments import RenderEnvironment
 from templatey.prebaked.loaders import InlineStringTemplateLoader
 
+from cleancopywriter._dispatch import resolve_by_mro
 from cleancopywriter._types import ClcTreeTransformer
 from cleancopywriter._types import DocumentBase
 from cleancopywriter._types import DocumentID
@@ -39,6 +41,10 @@ from cleancopywriter.html.prebaked.plugins import SimplePluginManager
 from cleancopywriter.html.templatifiers.clc import ClcRichtextBlocknodeTemplate
 from cleancopywriter.html.templatifiers.docnotes import ModuleSummaryTemplate
 
+# Parsed documents are held for the collection's whole lifetime, so the parse
+# cache needs a bound for long-running processes (for example, a dev server).
+PARSE_CACHE_MAXSIZE = 64
+
 
 @dataclass(slots=True)
 class HtmlDocument[TI: DocumentID, TS](
@@ -46,6 +52,13 @@ class HtmlDocument[TI: DocumentID, TS](
     """This is used as a base class for all supported html document
     types.
     """
+    prerendered_html: Annotated[
+            str | None,
+            Note('''If the document collection was created with a
+                ``render_env``, this will contain the rendered HTML for the
+                document, as rendered when the document was added to the
+                collection. Otherwise, it will be None.''')
+        ] = None
 
 
 @dataclass(slots=True)
@@ -103,8 +116,40 @@ class HtmlDocumentCollection[T: DocumentID, TC](Mapping[T, HtmlDocument]):
         ] = field(default_factory=list)
 
     abstractifier: Abstractifier = field(default_factory=Abstractifier)
+    render_env: Annotated[
+            RenderEnvironment | None,
+            Note('''If provided, documents will be rendered to HTML as soon
+                as they're added to the collection, and the result stored on
+                the document's ``prerendered_html``. Since the intermediate
+                representation doesn't change after the document is added,
+                this allows callers to serve the same document repeatedly
+                without re-rendering it.
+
+                Note that this uses ``render_sync``, so the environment must
+                have a sync-compatible template loader.''')
+        ] = None
+
+    cache_parsed_documents: Annotated[
+            bool,
+            Note('''If true, the collection remembers the parsed (but not
+                yet transformed) document for every cleancopy source it
+                preprocesses, keyed by a hash of the source. Preprocessing
+                the same source again then skips parsing entirely, which is
+                useful for incremental rebuilds. Only the most recently used
+                ``PARSE_CACHE_MAXSIZE`` documents are kept.
+
+                Note that cached documents are shared between all
+                preprocessing calls for the same source, so this must only
+                be enabled if none of the transformers modify nodes in
+                place.''')
+        ] = False
 
     _documents: dict[T, HtmlDocument] = field(default_factory=dict, repr=False)
+    _parse_cache: OrderedDict[bytes, ClcDocument] = field(
+        default_factory=OrderedDict, init=False, repr=False)
+    # Cached result of the ``documents`` view; reset by ``add``.
+    _documents_view: tuple[T, ...] | None = field(
+        default=None, init=False, repr=False)
     # This gets replaced by a _ProxyViewDescriptor!
     documents: tuple[T, ...] = field(init=False)
 
@@ -120,8 +165,33 @@ class HtmlDocumentCollection[T: DocumentID, TC](Mapping[T, HtmlDocument]):
         if isinstance(clc_text, str):
             clc_text = clc_text.encode('utf-8')
 
-        cst_doc = parse(clc_text)
-        ast_doc = self.abstractifier.convert(cst_doc)
+        return self._preprocess_bytes(clc_text, context)
+
+    def _preprocess_bytes(
+            self,
+            clc_bytes: bytes,
+            context: TC | None
+            ) -> ClcDocument:
+        """This is the actual implementation of ``preprocess``, for
+        callers that already have encoded bytes.
+        """
+        if self.cache_parsed_documents:
+            parse_cache = self._parse_cache
+            digest = blake2b(clc_bytes, digest_size=16).digest()
+            ast_doc = parse_cache.get(digest)
+            if ast_doc is None:
+                ast_doc = parse_cache[digest] = (
+                    self.abstractifier.convert(parse(clc_bytes)))
+                if len(parse_cache) > PARSE_CACHE_MAXSIZE:
+                    parse_cache.popitem(last=False)
+            else:
+                parse_cache.move_to_end(digest)
+
+        else:
+            ast_doc = self.abstractifier.convert(parse(clc_bytes))
+
+        # Note that the transformers are always applied, since they depend
+        # on the context.
         return apply_transformers(ast_doc, self.transformers, context)
 
     @overload
@@ -142,13 +212,14 @@ class HtmlDocumentCollection[T: DocumentID, TC](Mapping[T, HtmlDocument]):
         if id_ in self._documents:
             raise ValueError('Duplicate document ID!', id_)
 
+        document: HtmlDocument
         if (
             docnote_src is not None
             # We're anticipating adding more document types here, hence the
             # all() instead of a simple singular ``is None`` check
             and all(alt_src is None for alt_src in (clc_src,))
         ):
-            self._documents[id_] = DocnoteHtmlDocument(
+            document = DocnoteHtmlDocument(
                 id_=id_,
                 src=docnote_src,
                 intermediate_representation=ModuleSummaryTemplate.from_summary(
@@ -164,7 +235,7 @@ class HtmlDocumentCollection[T: DocumentID, TC](Mapping[T, HtmlDocument]):
             templatified = ClcRichtextBlocknodeTemplate.from_document(
                 clc_src, doc_coll=self)
 
-            self._documents[id_] = ClcHtmlDocument(
+            document = ClcHtmlDocument(
                 id_=id_,
                 src=clc_src,
                 intermediate_representation=templatified)
@@ -174,6 +245,13 @@ class HtmlDocumentCollection[T: DocumentID, TC](Mapping[T, HtmlDocument]):
                 'Can only specify one document source when adding to a '
                 + 'collection!')
 
+        if self.render_env is not None:
+            document.prerendered_html = self.render_env.render_sync(
+                document.intermediate_representation)
+
+        self._documents[id_] = document
+        self._documents_view = None
+
     def __contains__(self, id_: object) -> bool:
         return id_ in self._documents
 
@@ -201,8 +279,19 @@ class HtmlDocumentCollection[T: DocumentID, TC](Mapping[T, HtmlDocument]):
             ) ->  TD | HtmlDocument | None:
         return self._documents.get(key, default)
 
+
+def _get_documents_view[T: DocumentID](
+        doc_coll: HtmlDocumentCollection[T, Any]
+        ) -> tuple[T, ...]:
+    view = doc_coll._documents_view
+    if view is None:
+        view = doc_coll._documents_view = tuple(doc_coll._documents)
+
+    return view
+
+
 HtmlDocumentCollection.documents = _ProxyViewDescriptor(  # type: ignore
-    view_builder=lambda doc_coll: tuple(doc_coll._documents))  # type: ignore
+    view_builder=_get_documents_view)
 
 
 def apply_transformers[T](
@@ -225,18 +314,33 @@ def apply_transformers[T](
     return transformed
 
 
-@singledispatch
 def _apply_transformers[T](
-        node: ASTNode,
+        node: ASTNode | str,
         transformers: Sequence[ClcTreeTransformer[T]],
         context: T | None
-        ) -> ASTNode:
+        ) -> ASTNode | str:
     """This actually implements the transformations.
     """
+    # This recurses through every single node in the document (including the
+    # plain strings), so we dispatch via a plain dict instead of
+    # singledispatch.
+    node_type = type(node)
+    applier = _transformer_appliers.get(node_type)
+    if applier is None:
+        applier = resolve_by_mro(
+            _transformer_appliers, node_type, _apply_xform_passthrough)
+
+    return applier(node, transformers, context)
+
+
+def _apply_xform_passthrough[T](
+        node: ASTNode | str,
+        transformers: Sequence[ClcTreeTransformer[T]],
+        context: T | None
+        ) -> ASTNode | str:
     return node
 
 
-@_apply_transformers.register
 def _apply_xform_document[T](
         node: ClcDocument,
         transformers: Sequence[ClcTreeTransformer[T]],
@@ -268,7 +372,6 @@ def _apply_xform_document[T](
     return new_node
 
 
-@_apply_transformers.register
 def _apply_xform_richtextblocknode[T](
         node: RichtextBlockNode,
         transformers: Sequence[ClcTreeTransformer[T]],
@@ -307,7 +410,6 @@ def _apply_xform_richtextblocknode[T](
     return new_node
 
 
-@_apply_transformers.register
 def _apply_xform_embeddingblocknode[T](
         node: EmbeddingBlockNode,
         transformers: Sequence[ClcTreeTransformer[T]],
@@ -335,7 +437,6 @@ def _apply_xform_embeddingblocknode[T](
     return new_node
 
 
-@_apply_transformers.register
 def _apply_xform_paragraph[T](
         node: Paragraph,
         transformers: Sequence[ClcTreeTransformer[T]],
@@ -361,7 +462,6 @@ def _apply_xform_paragraph[T](
     return new_node
 
 
-@_apply_transformers.register
 def _apply_xform_list[T](
         node: List_,
         transformers: Sequence[ClcTreeTransformer[T]],
@@ -387,7 +487,6 @@ def _apply_xform_list[T](
     return new_node
 
 
-@_apply_transformers.register
 def _apply_xform_listitem[T](
         node: ListItem,
         transformers: Sequence[ClcTreeTransformer[T]],
@@ -413,7 +512,6 @@ def _apply_xform_listitem[T](
     return new_node
 
 
-@_apply_transformers.register
 def _apply_xform_richtextinlinenode[T](
         node: RichtextInlineNode,
         transformers: Sequence[ClcTreeTransformer[T]],
@@ -439,7 +537,6 @@ def _apply_xform_richtextinlinenode[T](
     return new_node
 
 
-@_apply_transformers.register
 def _apply_xform_annotation[T](
         node: Annotation,
         transformers: Sequence[ClcTreeTransformer[T]],
@@ -453,6 +550,18 @@ def _apply_xform_annotation[T](
     return new_node
 
 
+_transformer_appliers: dict[type, Callable[..., ASTNode | str]] = {
+    str: _apply_xform_passthrough,
+    ClcDocument: _apply_xform_document,
+    RichtextBlockNode: _apply_xform_richtextblocknode,
+    EmbeddingBlockNode: _apply_xform_embeddingblocknode,
+    Paragraph: _apply_xform_paragraph,
+    List_: _apply_xform_list,
+    ListItem: _apply_xform_listitem,
+    RichtextInlineNode: _apply_xform_richtextinlinenode,
+    Annotation: _apply_xform_annotation,}
+
+
 def quickrender(
         clc_text: str,
         plugin_manager: PluginManager | None = None
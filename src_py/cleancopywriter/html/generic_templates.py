@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
-from dataclasses import field
+from functools import lru_cache
 from typing import Annotated
 
 from docnote import DocnoteConfig
@@ -19,6 +19,15 @@ TEMPLATE_LOADER: Annotated[
         InlineStringTemplateLoader,
         DocnoteConfig(include_in_docs=False)
     ] = InlineStringTemplateLoader()
+# Shared by every slot that ends up empty (untitled blocks, undocumented
+# members, etc), so that we don't allocate a fresh container for each of them.
+EMPTY_SLOT: Annotated[
+        tuple,
+        DocnoteConfig(include_in_docs=False)
+    ] = ()
+# Strings up to this length get a shared ``PlaintextTemplate`` instance; see
+# ``plaintext_factory``.
+_SHARED_PLAINTEXT_MAX_LEN = 8
 type HtmlTemplate = HtmlGenericElement | PlaintextTemplate
 
 
@@ -29,7 +38,7 @@ type HtmlTemplate = HtmlGenericElement | PlaintextTemplate
     kw_only=True)
 class HtmlGenericElement:
     tag: Content[str]
-    attrs: Slot[HtmlAttr] = field(default_factory=list)
+    attrs: Slot[HtmlAttr] = ()
     body: DynamicClassSlot
 
 
@@ -44,6 +53,25 @@ class PlaintextTemplate:
     text: Var[str]
 
 
+def plaintext_factory(text: str) -> PlaintextTemplate:
+    """Wraps the passed text in a ``PlaintextTemplate``. Short strings
+    (single spaces, punctuation, etc) are extremely repetitive, so we
+    share a single template instance for each of them instead of
+    creating a new one every time.
+    """
+    if len(text) <= _SHARED_PLAINTEXT_MAX_LEN:
+        return _shared_plaintext(text)
+
+    return PlaintextTemplate(text=text)
+
+
+# Note: sharing the instances is safe because templates aren't mutated during
+# rendering.
+@lru_cache(maxsize=1024)
+def _shared_plaintext(text: str) -> PlaintextTemplate:
+    return PlaintextTemplate(text=text)
+
+
 def link_factory(
         body: Sequence[TemplateParamsInstance],
         href: str,
@@ -62,15 +90,17 @@ def heading_factory(
     ++  converts a zero-indexed depth to a 1-indexed heading
     ++  clamps the value to the allowable HTML range [1, 6]
     """
+    if type(depth) is not int:
+        depth = int(depth)
+
     if depth < 0:
-        heading_level = 1
+        depth = 0
     elif depth > 5:  # noqa: PLR2004
-        heading_level = 6
-    elif type(depth) is not int:
-        heading_level = int(depth) + 1
-    else:
-        heading_level = depth + 1
+        depth = 5
 
     return HtmlGenericElement(
-        tag=f'h{heading_level}',
+        tag=_HEADING_TAGS[depth],
         body=body)
+
+
+_HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import re
 import typing
+from collections.abc import Callable
+from collections.abc import Sequence
+from functools import lru_cache
+from functools import partial
 from html import escape as html_escape
-from textwrap import dedent
+from typing import Any
 from typing import Self
-from typing import cast
 
 from cleancopy.ast import Annotation
 from cleancopy.ast import ASTNode
@@ -41,6 +45,8 @@ from templatey.prebaked.template_configs import html
 from templatey.templates import FieldConfig
 from templatey.templates import template_field
 
+from cleancopywriter._dispatch import resolve_by_mro
+from cleancopywriter.html.generic_templates import EMPTY_SLOT
 from cleancopywriter.html.generic_templates import TEMPLATE_LOADER
 from cleancopywriter.html.generic_templates import HtmlAttr
 from cleancopywriter.html.generic_templates import HtmlGenericElement
@@ -48,6 +54,7 @@ from cleancopywriter.html.generic_templates import HtmlTemplate
 from cleancopywriter.html.generic_templates import PlaintextTemplate
 from cleancopywriter.html.generic_templates import heading_factory
 from cleancopywriter.html.generic_templates import link_factory
+from cleancopywriter.html.generic_templates import plaintext_factory
 
 if typing.TYPE_CHECKING:
     from cleancopywriter.html.documents import HtmlDocumentCollection
@@ -57,6 +64,7 @@ else:
     HtmlDocumentCollection = object
 
 INLINE_PRE_CLASSNAME = 'clc-fmt-pre'
+INLINE_PRE_ATTRS = (HtmlAttr(key='class', value=INLINE_PRE_CLASSNAME),)
 UNDERLINE_TAGNAME = 'clc-ul'
 DATATYPE_NAMES = {
     StrDataType: 'str',
@@ -68,105 +76,78 @@ DATATYPE_NAMES = {
     TagDataType: '#',
     VariableDataType: '%',
     ReferenceDataType: '&',}
-
-
-def _transform_spec_metadatas_block(value: BlockNodeInfo | None) -> str:  # noqa: C901
+# Most metadata values don't contain anything that needs escaping, so we check
+# for that up front with a single scan instead of always doing all of the
+# replacements.
+_NEEDS_ESCAPE = re.compile('[&<>"\']')
+
+
+# Metadata values (tags, mentions, enum-ish strings) repeat heavily across a
+# document tree, so it's worth caching the escaped versions.
+@lru_cache(maxsize=4096)
+def _fast_escape(value: str) -> str:
+    if _NEEDS_ESCAPE.search(value) is None:
+        return value
+
+    return html_escape(value, quote=True)
+
+
+# These are hoisted out of the transformers so that the per-node work is just
+# a flat iteration over the (fieldname, attribute name, is enum) triples.
+# They're sorted by fieldname so that the attributes come out in a stable order
+# without needing to sort them on every call.
+_BLOCK_METADATA_FIELDS: tuple[tuple[str, str, bool], ...] = tuple(sorted(
+    (
+        enum_member.name,
+        'embedding' if enum_member.name == 'embed'
+        else enum_member.name.replace('_', '-'),
+        # These are both enums that need special handling
+        enum_member.name in {'formatting', 'fallback'})
+    for enum_member in BlockMetadataMagic
+    # Skip this because it's only relevant for processing the AST
+    if enum_member.name != 'is_doc_metadata'))
+_INLINE_METADATA_FIELDS: tuple[tuple[str, str, bool], ...] = tuple(sorted(
+    (enum_member.name, enum_member.name.replace('_', '-'), False)
+    for enum_member in InlineMetadataMagic
+    # Skip these because they're handled by the actual processing code
+    if enum_member.name not in {'target', 'formatting', 'sugared'}))
+# A plain tuple is the fastest thing to hand to isinstance (the union syntax
+# goes through UnionType.__instancecheck__ instead).
+_NON_STRING_TARGET_TYPES = (
+    MentionDataType, TagDataType, VariableDataType, ReferenceDataType)
+
+
+def _transform_spec_metadatas(
+        value: BlockNodeInfo | InlineNodeInfo | None,
+        fields: tuple[tuple[str, str, bool], ...]
+        ) -> str:
     if value is None:
         return ''
 
-    spec_metadatas: dict[str, object] = {}
-    for enum_member in BlockMetadataMagic:
-        fieldname = enum_member.name
-
-        # Skip this because it's only relevant for processing the AST
-        if fieldname == 'is_doc_metadata':
-            continue
-
+    # Note that each attribute carries its own leading space, so an empty list
+    # naturally renders as an empty string.
+    attrs: list[str] = []
+    for fieldname, coerced_fieldname, is_enum in fields:
         field_value = getattr(value, fieldname)
         if field_value is not None:
-            # These are both enums that need special handling
-            if fieldname == 'formatting':
-                coerced_field_value = field_value.name.lower()
-            elif fieldname == 'fallback':
+            if is_enum:
                 coerced_field_value = field_value.name.lower()
-            elif isinstance(
-                field_value,
-                MentionDataType
-                | TagDataType
-                | VariableDataType
-                | ReferenceDataType
-            ):
-                raise NotImplementedError(
-                    'Non-string link targets not yet supported for spectype '
-                    + 'metadata', fieldname)
-            else:
-                coerced_field_value = html_escape(
-                    field_value.value, quote=True)
-
-            spec_metadatas[fieldname] = coerced_field_value
-
-    # Short-circuit so that we don't get an extra space for an empty list
-    if not spec_metadatas:
-        return ''
-
-    # First empty string here is so that we get an extra space at the beginning
-    # of the list
-    to_join: list[str] = ['']
-    for fieldname in sorted(spec_metadatas):
-        if fieldname == 'embed':
-            coerced_fieldname = 'embedding'
-        else:
-            coerced_fieldname = fieldname.replace('_', '-')
-
-        coerced_value = spec_metadatas[fieldname]
-        to_join.append(f'{coerced_fieldname}="{coerced_value}"')
-
-    return ' '.join(to_join)
-
-
-def _transform_spec_metadatas_inline(value: InlineNodeInfo | None) -> str:
-    if value is None:
-        return ''
-
-    spec_metadatas: dict[str, object] = {}
-    for enum_member in InlineMetadataMagic:
-        fieldname = enum_member.name
-
-        # Skip these because they're handled by the actual processing code
-        if fieldname in {'target', 'formatting', 'sugared'}:
-            continue
-
-        field_value = getattr(value, fieldname)
-        if field_value is not None:
-            if isinstance(
-                field_value,
-                MentionDataType
-                | TagDataType
-                | VariableDataType
-                | ReferenceDataType
-            ):
+            elif isinstance(field_value, _NON_STRING_TARGET_TYPES):
                 raise NotImplementedError(
                     'Non-string link targets not yet supported for spectype '
                     + 'metadata', fieldname)
             else:
-                coerced_field_value = html_escape(
-                    field_value.value, quote=True)
+                coerced_field_value = _fast_escape(field_value.value)
 
-            spec_metadatas[fieldname] = coerced_field_value
+            attrs.append(f' {coerced_fieldname}="{coerced_field_value}"')
 
-    # Short-circuit so that we don't get an extra space for an empty list
-    if not spec_metadatas:
-        return ''
+    return ''.join(attrs)
 
-    # First empty string here is so that we get an extra space at the beginning
-    # of the list
-    to_join: list[str] = ['']
-    for fieldname in sorted(spec_metadatas):
-        coerced_fieldname = fieldname.replace('_', '-')
-        coerced_value = spec_metadatas[fieldname]
-        to_join.append(f'{coerced_fieldname}="{coerced_value}"')
 
-    return ' '.join(to_join)
+_transform_spec_metadatas_block = partial(
+    _transform_spec_metadatas, fields=_BLOCK_METADATA_FIELDS)
+_transform_spec_metadatas_inline = partial(
+    _transform_spec_metadatas, fields=_INLINE_METADATA_FIELDS)
 
 
 @template(
@@ -186,47 +167,47 @@ class ClcMetadataTemplate:
             cls,
             node: NodeInfo,
             doc_coll: HtmlDocumentCollection
-            ) -> list[Self]:
-        retval: list[Self] = []
-        for key, datatyped_value in node.metadata.items():
-            # Special-case the null so that we can use an empty string for the
-            # value instead of ``None``
-            if isinstance(datatyped_value, NullDataType):
-                retval.append(cls(
-                    type_=DATATYPE_NAMES[type(datatyped_value)],
-                    key=key,
-                    value=''))
+            ) -> Sequence[Self]:
+        # Most nodes don't have any non-spec metadata at all
+        if not node.metadata:
+            return EMPTY_SLOT
+
+        # Note: DATATYPE_NAMES is keyed on the exact datatype, so an exact
+        # type check against the null is equivalent to isinstance here.
+        return [
+            cls(
+                type_=DATATYPE_NAMES[type(datatyped_value)],
+                key=key,
+                # Special-case the null so that we can use an empty string for
+                # the value instead of ``None``
+                value=''
+                    if type(datatyped_value) is NullDataType
+                    else _fast_escape(datatyped_value.value))
+            for key, datatyped_value in node.metadata.items()]
 
-            else:
-                retval.append(cls(
-                    type_=DATATYPE_NAMES[type(datatyped_value)],
-                    key=key,
-                    value=html_escape(datatyped_value.value, quote=True)))
 
-        return retval
+_ROLE_YES = ' role="article"'
+_ROLE_NO = ''
 
 
 def _transform_block_role(value: bool) -> str:
-    if value:
-        return ' role="article"'
-    else:
-        return ''
+    return _ROLE_YES if value else _ROLE_NO
 
 
 @template(
     html,
-    dedent('''\
-        <clc-block type="richtext"{content.role_if_root}{content.nodeinfo}{
-                slot.plugin_attrs: __prefix__=' '}>
-            <clc-header>
-                {slot.title}
-                <clc-metadatas>
-                    {slot.metadata}
-                </clc-metadatas>
-            </clc-header>
-            {slot.body}
-            <clc-widgets>{slot.plugin_widgets}</clc-widgets>
-        </clc-block>'''),
+    '''\
+<clc-block type="richtext"{content.role_if_root}{content.nodeinfo}{
+        slot.plugin_attrs: __prefix__=' '}>
+    <clc-header>
+        {slot.title}
+        <clc-metadatas>
+            {slot.metadata}
+        </clc-metadatas>
+    </clc-header>
+    {slot.body}
+    <clc-widgets>{slot.plugin_widgets}</clc-widgets>
+</clc-block>''',
     loader=TEMPLATE_LOADER)
 class ClcRichtextBlocknodeTemplate:
     """This template is used for richtext block nodes. Note that it
@@ -261,19 +242,16 @@ class ClcRichtextBlocknodeTemplate:
         """
         # This is a preemptive backwards-compatibility shim
         if isinstance(node, ClcDocument):
-            template_instance = cls.from_ast_node(node.root, doc_coll)
-
             # The only real compatibility issue is that we need to use the
             # metadata from the document object instead of the node object
-            # (but only if metadata is actually defined there)
-            if node.info is not None:
-                template_instance.metadata = ClcMetadataTemplate.from_ast_node(
-                    node.info, doc_coll)
-
-        else:
-            template_instance = cls.from_ast_node(node, doc_coll)
+            # (but only if metadata is actually defined there). Passing it
+            # through means we never build the root's metadata just to
+            # throw it away.
+            root = node.root
+            metadata_info = node.info if node.info is not None else root.info
+            return cls._from_ast_node(root, doc_coll, metadata_info)
 
-        return template_instance
+        return cls._from_ast_node(node, doc_coll, node.info)
 
     @classmethod
     def from_ast_node(
@@ -281,44 +259,50 @@ class ClcRichtextBlocknodeTemplate:
             node: RichtextBlockNode,
             doc_coll: HtmlDocumentCollection
             ) -> Self:
-        if node.title is None:
-            title = []
-        else:
-            title = [heading_factory(
-                depth=node.depth,
-                body=[ClcRichtextInlineNodeTemplate.from_ast_node(
-                        node.title, doc_coll)])]
-
-        templatified_content = []
-        for paragraph_or_node in node.content:
-            if isinstance(paragraph_or_node, Paragraph):
-                templatified_content.append(
-                    ClcParagraphTemplate.from_ast_node(
-                        paragraph_or_node, doc_coll))
-
-            elif isinstance(paragraph_or_node, EmbeddingBlockNode):
-                templatified_content.append(
-                    ClcEmbeddingBlocknodeTemplate.from_ast_node(
-                        paragraph_or_node, doc_coll))
-
-            elif isinstance(paragraph_or_node, RichtextBlockNode):
-                templatified_content.append(
-                    ClcRichtextBlocknodeTemplate.from_ast_node(
-                        paragraph_or_node, doc_coll))
+        return cls._from_ast_node(node, doc_coll, node.info)
 
-            else:
-                raise TypeError(
-                    'Invalid child of richtext blocknode!', paragraph_or_node)
+    @classmethod
+    def _from_ast_node(
+            cls,
+            node: RichtextBlockNode,
+            doc_coll: HtmlDocumentCollection,
+            metadata_info: BlockNodeInfo | None
+            ) -> Self:
+        """Does the actual work for both ``from_ast_node`` and
+        ``from_document``, which differ only in where the metadata
+        comes from.
+        """
+        info = node.info
+        depth = node.depth
+        title_node = node.title
+        if title_node is None:
+            title = EMPTY_SLOT
+        else:
+            title = (heading_factory(
+                depth=depth,
+                body=(ClcRichtextInlineNodeTemplate.from_ast_node(
+                        title_node, doc_coll),)),)
+
+        templatified_content = [
+            (
+                _richtext_block_children.get(type(paragraph_or_node))
+                or _resolve_child_templatifier(
+                    _richtext_block_children,
+                    paragraph_or_node,
+                    'Invalid child of richtext blocknode!')
+            )(paragraph_or_node, doc_coll)
+            for paragraph_or_node in node.content]
 
         plugin_attrs, plugin_widgets = _apply_plugins(
             doc_coll, RichtextBlockNode, node)
         return cls(
             title=title,
             metadata=ClcMetadataTemplate.from_ast_node(
-                node.info, doc_coll) if node.info is not None else [],
-            role_if_root=node.depth <= 0,
+                metadata_info, doc_coll)
+                if metadata_info is not None else EMPTY_SLOT,
+            role_if_root=depth <= 0,
             body=templatified_content,
-            nodeinfo=node.info,
+            nodeinfo=info,
             plugin_attrs=plugin_attrs,
             plugin_widgets=plugin_widgets)
 
@@ -349,18 +333,18 @@ class ClcEmbeddingPluginContentTemplate:
 
 @template(
     html,
-    dedent('''\
-        <clc-block type="embedding"{content.nodeinfo}{
-                slot.plugin_attrs: __prefix__=' '}>
-            <clc-header>
-                {slot.title}
-                <clc-metadatas>
-                    {slot.metadata}
-                </clc-metadatas>
-            </clc-header>
-            {slot.embedding_content}
-            <clc-widgets>{slot.plugin_widgets}</clc-widgets>
-        </clc-block>'''),
+    '''\
+<clc-block type="embedding"{content.nodeinfo}{
+        slot.plugin_attrs: __prefix__=' '}>
+    <clc-header>
+        {slot.title}
+        <clc-metadatas>
+            {slot.metadata}
+        </clc-metadatas>
+    </clc-header>
+    {slot.embedding_content}
+    <clc-widgets>{slot.plugin_widgets}</clc-widgets>
+</clc-block>''',
     loader=TEMPLATE_LOADER)
 class ClcEmbeddingBlocknodeTemplate:
     """This template is used to contain embedding block
@@ -388,22 +372,24 @@ class ClcEmbeddingBlocknodeTemplate:
             node: EmbeddingBlockNode,
             doc_coll: HtmlDocumentCollection
             ) -> Self:
-        if node.title is None:
-            title = []
+        info = node.info
+        title_node = node.title
+        if title_node is None:
+            title = EMPTY_SLOT
         else:
-            title = [heading_factory(
+            title = (heading_factory(
                 depth=node.depth,
-                body=[ClcRichtextInlineNodeTemplate.from_ast_node(
-                        node.title, doc_coll)])]
+                body=(ClcRichtextInlineNodeTemplate.from_ast_node(
+                        title_node, doc_coll),)),)
 
         plugin_attrs, plugin_widgets = _apply_plugins(
             doc_coll, EmbeddingBlockNode, node)
 
-        if node.info is None:
+        if info is None:
             raise TypeError(
                 'Impossible branch: embedding block node without nodeinfo!',
                 node)
-        if node.info.embed is None:
+        if info.embed is None:
             raise TypeError(
                 'Impossible branch: embedding block node with null '
                 + 'nodeinfo.embed!', node)
@@ -411,14 +397,14 @@ class ClcEmbeddingBlocknodeTemplate:
         embedding_content: list[
             ClcEmbeddingFallbackContentTemplate
             | ClcEmbeddingPluginContentTemplate] = []
-        embedding_type = node.info.embed.value
+        embedding_type = info.embed.value
         embeddings_plugins = doc_coll.plugin_manager.get_embeddings_plugins(
             embedding_type)
         for embeddings_plugin in embeddings_plugins:
             plugin_injection = embeddings_plugin(node, embedding_type)
             if plugin_injection is not None:
                 if plugin_injection.widgets is None:
-                    injection_body = []
+                    injection_body = EMPTY_SLOT
                 else:
                     injection_body = plugin_injection.widgets
 
@@ -434,7 +420,7 @@ class ClcEmbeddingBlocknodeTemplate:
 
         else:
             if node.content is None:
-                plaintext_body = []
+                plaintext_body = EMPTY_SLOT
             else:
                 plaintext_body = [PlaintextTemplate(text=node.content)]
 
@@ -443,25 +429,25 @@ class ClcEmbeddingBlocknodeTemplate:
 
         return cls(
             title=title,
-            metadata=ClcMetadataTemplate.from_ast_node(node.info, doc_coll),
+            metadata=ClcMetadataTemplate.from_ast_node(info, doc_coll),
             embedding_content=embedding_content,
-            nodeinfo=node.info,
+            nodeinfo=info,
             plugin_attrs=plugin_attrs,
             plugin_widgets=plugin_widgets)
 
 
 @template(
     html,
-    dedent('''\
-        <clc-context{content.nodeinfo}{slot.plugin_attrs: __prefix__=' '}>
-            <clc-header>
-                <clc-metadatas>
-                    {slot.metadata}
-                </clc-metadatas>
-            </clc-header>
-            {slot.body}
-            <clc-widgets>{slot.plugin_widgets}</clc-widgets>
-        </clc-context>'''),
+    '''\
+<clc-context{content.nodeinfo}{slot.plugin_attrs: __prefix__=' '}>
+    <clc-header>
+        <clc-metadatas>
+            {slot.metadata}
+        </clc-metadatas>
+    </clc-header>
+    {slot.body}
+    <clc-widgets>{slot.plugin_widgets}</clc-widgets>
+</clc-context>''',
     loader=TEMPLATE_LOADER)
 class ClcRichtextInlineNodeTemplate:
     """This is used as the outermost wrapper for inline richtext nodes.
@@ -486,13 +472,15 @@ class ClcRichtextInlineNodeTemplate:
             ) -> Self:
         contained_content: list[
             HtmlTemplate | ClcRichtextInlineNodeTemplate] = []
+        append_content = contained_content.append
         for content_segment in node.content:
-            if isinstance(content_segment, str):
-                contained_content.append(
-                    PlaintextTemplate(text=content_segment))
+            # Text segments vastly outnumber nested nodes, and the parser
+            # only ever gives us plain strs, so check the exact type first.
+            if type(content_segment) is str:
+                append_content(plaintext_factory(content_segment))
 
             elif isinstance(content_segment, RichtextInlineNode):
-                contained_content.append(
+                append_content(
                     ClcRichtextInlineNodeTemplate.from_ast_node(
                         content_segment, doc_coll))
 
@@ -505,20 +493,31 @@ class ClcRichtextInlineNodeTemplate:
         info = node.info
         if info is None:
             return cls(
-                metadata=[],
+                metadata=EMPTY_SLOT,
                 body=contained_content,
                 nodeinfo=None,
                 plugin_attrs=plugin_attrs,
                 plugin_widgets=plugin_widgets)
 
         else:
+            if info.formatting is not None:
+                contained_content = [formatting_factory(
+                    info.formatting,
+                    contained_content)]
+
+            if info.target is not None:
+                if isinstance(info.target, StrDataType):
+                    href = info.target.value
+                else:
+                    href = doc_coll.target_resolver(info.target)
+
+                contained_content = [link_factory(
+                    href=href,
+                    body=contained_content)]  # type: ignore
+
             return cls(
-                metadata=ClcMetadataTemplate.from_ast_node(
-                    node.info, doc_coll) if node.info is not None else [],
-                body=_wrap_in_richtext_context(
-                    contained_content,
-                    cast(InlineNodeInfo, info),
-                    doc_coll=doc_coll),
+                metadata=ClcMetadataTemplate.from_ast_node(info, doc_coll),
+                body=contained_content,
                 nodeinfo=info,
                 plugin_attrs=plugin_attrs,
                 plugin_widgets=plugin_widgets)
@@ -550,33 +549,31 @@ class ClcParagraphTemplate:
             node: Paragraph,
             doc_coll: HtmlDocumentCollection
             ) -> Self:
-        body = []
-        for nested in node.content:
-            if isinstance(nested, RichtextInlineNode):
-                body.append(
-                    ClcRichtextInlineNodeTemplate.from_ast_node(
-                        nested, doc_coll))
-
-            elif isinstance(nested, List_):
-                body.append(
-                    ClcListTemplate.from_ast_node(nested, doc_coll))
-
-            elif isinstance(nested, Annotation):
-                body.append(
-                    ClcAnnotationTemplate.from_ast_node(nested, doc_coll))
-
-            else:
-                raise TypeError('Invalid child of paragraph!', nested)
-
-        return cls(body=body)
+        content = node.content
+        # Most paragraphs are just a single run of inline text, so skip the
+        # general-purpose loop for them.
+        if len(content) == 1 and type(content[0]) is RichtextInlineNode:
+            return cls(body=[
+                ClcRichtextInlineNodeTemplate.from_ast_node(
+                    content[0], doc_coll)])
+
+        return cls(body=[
+            (
+                _paragraph_children.get(type(nested))
+                or _resolve_child_templatifier(
+                    _paragraph_children,
+                    nested,
+                    'Invalid child of paragraph!')
+            )(nested, doc_coll)
+            for nested in content])
 
 
 @template(
     html,
-    dedent('''\
-        <{content.tag}>
-            {slot.items}
-        </{content.tag}>'''),
+    '''\
+<{content.tag}>
+    {slot.items}
+</{content.tag}>''',
     loader=TEMPLATE_LOADER)
 class ClcListTemplate:
     """Annotations get converted to comments.
@@ -595,15 +592,17 @@ class ClcListTemplate:
         else:
             tag = 'ul'
 
-        items: list[ClcListItemTemplate] = []
-        for nested in node.content:
-            items.append(ClcListItemTemplate.from_ast_node(nested, doc_coll))
-
         return cls(
             tag=tag,
-            items=items)
+            items=[
+                ClcListItemTemplate.from_ast_node(nested, doc_coll)
+                for nested in node.content])
 
 
+# List item indices are almost always small and heavily repeated (every
+# ordered list starts counting from 1), so it's worth caching the formatted
+# attribute.
+@lru_cache(maxsize=1024)
 def _transform_listitem_index(value: int | None) -> str:
     if value is None:
         return ''
@@ -659,33 +658,11 @@ def formatting_factory(
         spectype: InlineFormatting,
         body: list[HtmlTemplate | ClcRichtextInlineNodeTemplate]
         ) -> HtmlGenericElement:
-    if spectype is InlineFormatting.PRE:
-        tag = 'code'
-        attrs = [HtmlAttr(key='class', value=INLINE_PRE_CLASSNAME)]
-
-    elif spectype is InlineFormatting.UNDERLINE:
-        tag = UNDERLINE_TAGNAME
-        attrs = []
-
-    elif spectype is InlineFormatting.STRONG:
-        tag = 'strong'
-        attrs = []
-
-    elif spectype is InlineFormatting.EMPHASIS:
-        tag = 'em'
-        attrs = []
-
-    elif spectype is InlineFormatting.STRIKE:
-        tag = 's'
-        attrs = []
-
-    elif spectype is InlineFormatting.QUOTE:
-        tag = 'q'
-        attrs = []
-
-    else:
+    try:
+        tag, attrs = _INLINE_FORMATTING_ELEMENTS[spectype]
+    except KeyError as exc:
         raise TypeError(
-            'Invalid spectype for inline formatting!', spectype)
+            'Invalid spectype for inline formatting!', spectype) from exc
 
     return HtmlGenericElement(
         tag=tag,
@@ -693,28 +670,56 @@ def formatting_factory(
         body=body)
 
 
-def _wrap_in_richtext_context(
-        contained_content: list[HtmlTemplate | ClcRichtextInlineNodeTemplate],
-        info: InlineNodeInfo,
-        *,
-        doc_coll: HtmlDocumentCollection
-        ) -> list[HtmlTemplate | ClcRichtextInlineNodeTemplate]:
-    if info.formatting is not None:
-        contained_content = [formatting_factory(
-            info.formatting,
-            contained_content)]
-
-    if info.target is None:
-        return contained_content
-    else:
-        if isinstance(info.target, StrDataType):
-            href = info.target.value
-        else:
-            href = doc_coll.target_resolver(info.target)
+# Note that the attrs are shared between all of the elements. That's fine,
+# since they're never mutated after construction, and it saves us from
+# creating a fresh attr (and list) for every single inline code span.
+_INLINE_FORMATTING_ELEMENTS: dict[
+    InlineFormatting, tuple[str, tuple[HtmlAttr, ...]]
+] = {
+    InlineFormatting.PRE: ('code', INLINE_PRE_ATTRS),
+    InlineFormatting.UNDERLINE: (UNDERLINE_TAGNAME, ()),
+    InlineFormatting.STRONG: ('strong', ()),
+    InlineFormatting.EMPHASIS: ('em', ()),
+    InlineFormatting.STRIKE: ('s', ()),
+    InlineFormatting.QUOTE: ('q', ()),}
+
+
+# The child node types of both richtext blocks and paragraphs are closed sets,
+# so we dispatch on the exact type instead of walking an isinstance chain for
+# every single child.
+type _BlockChildTemplatifier = Callable[
+    [Any, HtmlDocumentCollection],
+    ClcParagraphTemplate
+    | ClcEmbeddingBlocknodeTemplate
+    | ClcRichtextBlocknodeTemplate]
+type _ParagraphChildTemplatifier = Callable[
+    [Any, HtmlDocumentCollection],
+    ClcRichtextInlineNodeTemplate
+    | ClcAnnotationTemplate
+    | ClcListTemplate]
+_richtext_block_children: dict[type, _BlockChildTemplatifier] = {
+    Paragraph: ClcParagraphTemplate.from_ast_node,
+    EmbeddingBlockNode: ClcEmbeddingBlocknodeTemplate.from_ast_node,
+    RichtextBlockNode: ClcRichtextBlocknodeTemplate.from_ast_node,}
+_paragraph_children: dict[type, _ParagraphChildTemplatifier] = {
+    RichtextInlineNode: ClcRichtextInlineNodeTemplate.from_ast_node,
+    List_: ClcListTemplate.from_ast_node,
+    Annotation: ClcAnnotationTemplate.from_ast_node,}
+
+
+def _resolve_child_templatifier[T](
+        lookup: dict[type, T],
+        child: object,
+        errmsg: str
+        ) -> T:
+    """Falls back to the MRO for subclasses of the AST node types.
+    Raises a TypeError if the child isn't valid at all.
+    """
+    templatifier = resolve_by_mro(lookup, type(child), None)
+    if templatifier is None:
+        raise TypeError(errmsg, child)
 
-        return [link_factory(
-            href=href,
-            body=contained_content)]  # type: ignore
+    return templatifier
 
 
 def _apply_plugins[T: ASTNode](
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import typing
-from collections.abc import Iterator
+from collections.abc import Callable
+from collections.abc import Iterable
 from collections.abc import Sequence
-from dataclasses import field
+from contextvars import ContextVar
 from dataclasses import fields
-from functools import singledispatch
-from textwrap import dedent
+from functools import lru_cache
+from operator import attrgetter
 from typing import Self
 from typing import overload
 
@@ -50,28 +51,37 @@ from templatey.prebaked.template_configs import html
 from templatey.templates import FieldConfig
 from templatey.templates import template_field
 
+from cleancopywriter._dispatch import resolve_by_mro
+from cleancopywriter.html.generic_templates import EMPTY_SLOT
 from cleancopywriter.html.generic_templates import TEMPLATE_LOADER
 from cleancopywriter.html.generic_templates import HtmlAttr
 from cleancopywriter.html.generic_templates import HtmlGenericElement
 from cleancopywriter.html.generic_templates import HtmlTemplate
 from cleancopywriter.html.generic_templates import PlaintextTemplate
-from cleancopywriter.html.templatifiers.clc import INLINE_PRE_CLASSNAME
+from cleancopywriter.html.templatifiers.clc import INLINE_PRE_ATTRS
 from cleancopywriter.html.templatifiers.clc import ClcRichtextBlocknodeTemplate
 from cleancopywriter.html.templatifiers.clc import formatting_factory
 
 if typing.TYPE_CHECKING:
     from cleancopywriter.html.documents import HtmlDocumentCollection
 
+_sort_key_name = attrgetter('name')
+_sort_key_index = attrgetter('index')
+
+
+def _sort_key_ordering_index(signature: SignatureSummary) -> int:
+    return signature.ordering_index or 0
+
 
 @template(
     html,
     # Note: we're not doing a role of list here, because the child elements
     # may or may not be list items (because they can also be used outside of
     # a literal) and therefore there's no way to distinguish between them
-    dedent('''\
-        <docnote-fallback-container>
-            {slot.wraps}
-        </docnote-fallback-container>'''),
+    '''\
+<docnote-fallback-container>
+    {slot.wraps}
+</docnote-fallback-container>''',
     loader=TEMPLATE_LOADER)
 class FallbackContainerTemplate:
     """Fallback templates are used for docnote things we haven't fully
@@ -83,23 +93,23 @@ class FallbackContainerTemplate:
 
 @template(
     html,
-    dedent('''\
-        <docnote-module role="article" {slot.plugin_attrs}>
-            <docnote-header>
-                <docnote-name obj-type="module" role="heading" aria-level="1">
-                    {var.fullname}
-                </docnote-name>
-                <docnote-docstring obj-type="module">
-                    {slot.docstring}
-                </docnote-docstring>
-                <docnote-module-dunderall role="list">
-                    {slot.dunder_all}
-                </docnote-module-dunderall>
-            </docnote-header>
-            {slot.members}
-            <docnote-widgets>{slot.plugin_widgets}</docnote-widgets>
-        </docnote-module>
-        '''),
+    '''\
+<docnote-module role="article" {slot.plugin_attrs}>
+    <docnote-header>
+        <docnote-name obj-type="module" role="heading" aria-level="1">
+            {var.fullname}
+        </docnote-name>
+        <docnote-docstring obj-type="module">
+            {slot.docstring}
+        </docnote-docstring>
+        <docnote-module-dunderall role="list">
+            {slot.dunder_all}
+        </docnote-module-dunderall>
+    </docnote-header>
+    {slot.members}
+    <docnote-widgets>{slot.plugin_widgets}</docnote-widgets>
+</docnote-module>
+''',
     loader=TEMPLATE_LOADER)
 class ModuleSummaryTemplate:
     fullname: Var[str]
@@ -119,54 +129,61 @@ class ModuleSummaryTemplate:
             doc_coll: HtmlDocumentCollection
             ) -> Self:
         if summary_node.docstring is None:
-            docstring = []
+            docstring = EMPTY_SLOT
         else:
             docstring = templatify_doctext(
                 summary_node.docstring, doc_coll, summary_node.metadata)
 
         if summary_node.dunder_all is None:
-            dunder_all = []
+            dunder_all = EMPTY_SLOT
         else:
             dunder_all = dunder_all_factory(sorted(summary_node.dunder_all))
 
         plugin_attrs, plugin_widgets = _apply_plugins(
             doc_coll, ModuleSummary, summary_node)
+        cache_token = _concrete_type_cache.set({})
+        try:
+            members = [
+                get_template_cls(member).from_summary(member, doc_coll)  # type: ignore
+                for member in cls.sort_members(
+                    member for member in summary_node.members
+                    if should_include(member.metadata))]
+        finally:
+            _concrete_type_cache.reset(cache_token)
+
         return cls(
             fullname=summary_node.name,
             docstring=docstring,
             dunder_all=dunder_all,
-            members=[
-                get_template_cls(member).from_summary(member, doc_coll)  # type: ignore
-                for member in cls.sort_members(summary_node.members)
-                if should_include(member.metadata)],
+            members=members,
             plugin_attrs=plugin_attrs,
             plugin_widgets=plugin_widgets)
 
     @classmethod
     def sort_members(
             cls,
-            members: frozenset[NamespaceMemberSummary]
+            members: Iterable[NamespaceMemberSummary]
             ) -> list[NamespaceMemberSummary]:
         # TODO: this needs to support ordering index and groupings!
-        return sorted(members, key=lambda member: member.name)
+        return sorted(members, key=_sort_key_name)
 
 
 @template(
     html,
-    dedent('''\
-        <docnote-attribute {slot.plugin_attrs}>
-            <docnote-header>
-                <docnote-name obj-type="attribute" role="heading" aria-level="2">
-                    {var.name}
-                </docnote-name>
-                {slot.typespec}
-            </docnote-header>
-            <docnote-notes>
-                {slot.notes}
-            </docnote-notes>
-            <docnote-widgets>{slot.plugin_widgets}</docnote-widgets>
-        </docnote-attribute>
-        '''),  # noqa: E501
+    '''\
+<docnote-attribute {slot.plugin_attrs}>
+    <docnote-header>
+        <docnote-name obj-type="attribute" role="heading" aria-level="2">
+            {var.name}
+        </docnote-name>
+        {slot.typespec}
+    </docnote-header>
+    <docnote-notes>
+        {slot.notes}
+    </docnote-notes>
+    <docnote-widgets>{slot.plugin_widgets}</docnote-widgets>
+</docnote-attribute>
+''',
     loader=TEMPLATE_LOADER)
 class VariableSummaryTemplate:
     name: Var[str]
@@ -182,20 +199,17 @@ class VariableSummaryTemplate:
             summary_node: VariableSummary,
             doc_coll: HtmlDocumentCollection
             ) -> Self:
-        rendered_notes: list[ClcRichtextBlocknodeTemplate | HtmlTemplate] = []
-        for note in summary_node.notes:
-            rendered_notes.extend(
-                templatify_doctext(
-                    note, doc_coll, summary_node.metadata))
+        rendered_notes = _templatify_notes(
+            summary_node.notes, doc_coll, summary_node.metadata)
 
         plugin_attrs, plugin_widgets = _apply_plugins(
             doc_coll, VariableSummary, summary_node)
         return cls(
             name=summary_node.name,
             typespec=
-                [templatify_typespec(summary_node.typespec)]
+                (templatify_typespec(summary_node.typespec),)
                 if summary_node.typespec is not None
-                else (),
+                else EMPTY_SLOT,
             notes=rendered_notes,
             plugin_attrs=plugin_attrs,
             plugin_widgets=plugin_widgets)
@@ -203,30 +217,30 @@ class VariableSummaryTemplate:
 
 @template(
     html,
-    dedent('''\
-        <docnote-class {slot.plugin_attrs}>
-            <docnote-header>
-                <docnote-name obj-type="class" role="heading" aria-level="2">
-                    {var.name}
-                </docnote-name>
-                <docnote-class-metaclass>
-                    {slot.metaclass}
-                </docnote-class-metaclass>
-                <docnote-class-bases-container>
-                    <docnote-class-bases role="list">
-                        {slot.bases:
-                        __prefix__='<docnote-class-base role="listitem">',
-                        __suffix__='</docnote-class-base>'}
-                    </docnote-class-bases>
-                </docnote-class-bases-container>
-                <docnote-docstring obj-type="class">
-                    {slot.docstring}
-                </docnote-docstring>
-            </docnote-header>
-            {slot.members}
-            <docnote-widgets>{slot.plugin_widgets}</docnote-widgets>
-        </docnote-class>
-        '''),
+    '''\
+<docnote-class {slot.plugin_attrs}>
+    <docnote-header>
+        <docnote-name obj-type="class" role="heading" aria-level="2">
+            {var.name}
+        </docnote-name>
+        <docnote-class-metaclass>
+            {slot.metaclass}
+        </docnote-class-metaclass>
+        <docnote-class-bases-container>
+            <docnote-class-bases role="list">
+                {slot.bases:
+                __prefix__='<docnote-class-base role="listitem">',
+                __suffix__='</docnote-class-base>'}
+            </docnote-class-bases>
+        </docnote-class-bases-container>
+        <docnote-docstring obj-type="class">
+            {slot.docstring}
+        </docnote-docstring>
+    </docnote-header>
+    {slot.members}
+    <docnote-widgets>{slot.plugin_widgets}</docnote-widgets>
+</docnote-class>
+''',
     loader=TEMPLATE_LOADER)
 class ClassSummaryTemplate:
     name: Var[str]
@@ -247,7 +261,7 @@ class ClassSummaryTemplate:
             doc_coll: HtmlDocumentCollection
             ) -> Self:
         if summary_node.docstring is None:
-            docstring = []
+            docstring = EMPTY_SLOT
         else:
             docstring = templatify_doctext(
                 summary_node.docstring, doc_coll, summary_node.metadata)
@@ -257,77 +271,81 @@ class ClassSummaryTemplate:
         return cls(
             name=summary_node.name,
             metaclass=
-                [templatify_concrete_typespec(summary_node.metaclass)]
+                (templatify_concrete_typespec(summary_node.metaclass),)
                 if summary_node.metaclass is not None
-                else (),
+                else EMPTY_SLOT,
             docstring=docstring,
             bases=[
                 templatify_concrete_typespec(base)
                 for base in summary_node.bases],
             members=[
                 get_template_cls(member).from_summary(member, doc_coll)  # type: ignore
-                for member in cls.sort_members(summary_node.members)
-                if should_include(member.metadata)],
+                for member in cls.sort_members(
+                    member for member in summary_node.members
+                    if should_include(member.metadata))],
             plugin_attrs=plugin_attrs,
             plugin_widgets=plugin_widgets)
 
     @classmethod
     def sort_members(
             cls,
-            members: frozenset[NamespaceMemberSummary]
+            members: Iterable[NamespaceMemberSummary]
             ) -> list[NamespaceMemberSummary]:
         # TODO: this needs to support ordering index and groupings!
-        return sorted(members, key=lambda member: member.name)
+        return sorted(members, key=_sort_key_name)
+
+
+# These transformers all have tiny input domains, so we just precompute every
+# possible output and look it up. Anything outside of the tables still gets a
+# sensible fallback instead of failing the whole render.
+_IS_GENERATOR_TABLE = {
+    True: 'generator="true"',
+    False: 'generator="false"',}
+_METHOD_TYPE_TABLE = {
+    MethodType.INSTANCE: 'method-type="instancemethod"',
+    MethodType.CLASS: 'method-type="classmethod"',
+    MethodType.STATIC: 'method-type="staticmethod"',
+    None: 'method-type="null"',}
+_CALLABLE_COLOR_TABLE = {
+    CallableColor.ASYNC: 'call-color="async"',
+    CallableColor.SYNC: 'call-color="sync"',}
 
 
 def _transform_is_generator(value: bool) -> str:
-    if value:
-        return 'generator="true"'
-    else:
-        return 'generator="false"'
+    return _IS_GENERATOR_TABLE[bool(value)]
 
 
 def _transform_method_type(value: MethodType | None) -> str:
-    if value is MethodType.INSTANCE:
-        return 'method-type="instancemethod"'
-    elif value is MethodType.CLASS:
-        return 'method-type="classmethod"'
-    elif value is MethodType.STATIC:
-        return 'method-type="staticmethod"'
-    else:
-        return 'method-type="null"'
+    return _METHOD_TYPE_TABLE.get(value, 'method-type="null"')
 
 
 def _transform_callable_color(value: CallableColor) -> str:
-    if value is CallableColor.ASYNC:
-        return 'call-color="async"'
-    else:
-        return 'call-color="sync"'
+    return _CALLABLE_COLOR_TABLE.get(value, 'call-color="sync"')
 
 
 @template(
     html,
-    dedent('''\
-        <docnote-callable {slot.plugin_attrs}>
-            <docnote-header>
-                <docnote-name obj-type="callable" role="heading" aria-level="2">
-                    {var.name}
-                </docnote-name>
-                <docnote-docstring obj-type="callable">
-                    {slot.docstring}
-                </docnote-docstring>
-                <docnote-tags>
-                    <docnote-tag {content.color}></docnote-tag>
-                    <docnote-tag {content.method_type}></docnote-tag>
-                    <docnote-tag {content.is_generator}></docnote-tag>
-                </docnote-tags>
-            </docnote-header>
-            <docnote-callable-signatures>
-                {slot.signatures}
-            </docnote-callable-signatures>
-            <docnote-widgets>{slot.plugin_widgets}</docnote-widgets>
-        </docnote-callable>
-        '''),  # noqa: E501
+    '''\
+<docnote-callable {slot.plugin_attrs}>
+    <docnote-header>
+        <docnote-name obj-type="callable" role="heading" aria-level="2">
+            {var.name}
+        </docnote-name>
+        <docnote-docstring obj-type="callable">
+            {slot.docstring}
+        </docnote-docstring>
+        <docnote-tags>
+            <docnote-tag {content.color}></docnote-tag>
+            <docnote-tag {content.method_type}></docnote-tag>
+            <docnote-tag {content.is_generator}></docnote-tag>
+        </docnote-tags>
+    </docnote-header>
+    <docnote-callable-signatures>
+        {slot.signatures}
+    </docnote-callable-signatures>
+    <docnote-widgets>{slot.plugin_widgets}</docnote-widgets>
+</docnote-callable>
+''',
     loader=TEMPLATE_LOADER)
 class CallableSummaryTemplate:
     name: Var[str]
@@ -352,7 +370,7 @@ class CallableSummaryTemplate:
             doc_coll: HtmlDocumentCollection
             ) -> Self:
         if summary_node.docstring is None:
-            docstring = []
+            docstring = EMPTY_SLOT
         else:
             docstring = templatify_doctext(
                 summary_node.docstring, doc_coll, summary_node.metadata)
@@ -368,39 +386,40 @@ class CallableSummaryTemplate:
             signatures=[
                 SignatureSummaryTemplate.from_summary(
                     signature, doc_coll)
-                for signature in cls.sort_signatures(summary_node.signatures)
-                if should_include(signature.metadata)],
+                for signature in cls.sort_signatures(
+                    signature for signature in summary_node.signatures
+                    if should_include(signature.metadata))],
             plugin_attrs=plugin_attrs,
             plugin_widgets=plugin_widgets)
 
     @classmethod
     def sort_signatures(
             cls,
-            members: frozenset[SignatureSummary]
+            members: Iterable[SignatureSummary]
             ) -> list[SignatureSummary]:
         # TODO: this needs to support groupings, and we need to verify that
         # ordering index is always set on signature summaries!
-        return sorted(members, key=lambda member: member.ordering_index or 0)
+        return sorted(members, key=_sort_key_ordering_index)
 
 
 @template(
     html,
-    dedent('''\
-        <docnote-callable-signature {slot.plugin_attrs}>
-            <docnote-header>
-                <docnote-docstring obj-type="callable-signature">
-                    {slot.docstring}
-                </docnote-docstring>
-            </docnote-header>
-            <docnote-callable-signature-params role="list">
-                {slot.params}
-            </docnote-callable-signature-params>
-            <docnote-callable-signature-retval>
-                {slot.retval}
-            </docnote-callable-signature-retval>
-            <docnote-widgets>{slot.plugin_widgets}</docnote-widgets>
-        </docnote-callable-signature>
-        '''),
+    '''\
+<docnote-callable-signature {slot.plugin_attrs}>
+    <docnote-header>
+        <docnote-docstring obj-type="callable-signature">
+            {slot.docstring}
+        </docnote-docstring>
+    </docnote-header>
+    <docnote-callable-signature-params role="list">
+        {slot.params}
+    </docnote-callable-signature-params>
+    <docnote-callable-signature-retval>
+        {slot.retval}
+    </docnote-callable-signature-retval>
+    <docnote-widgets>{slot.plugin_widgets}</docnote-widgets>
+</docnote-callable-signature>
+''',
     loader=TEMPLATE_LOADER)
 class SignatureSummaryTemplate:
     params: Slot[ParamSummaryTemplate]
@@ -417,7 +436,7 @@ class SignatureSummaryTemplate:
             doc_coll: HtmlDocumentCollection
             ) -> Self:
         if summary_node.docstring is None:
-            docstring = []
+            docstring = EMPTY_SLOT
         else:
             docstring = templatify_doctext(
                 summary_node.docstring, doc_coll, summary_node.metadata)
@@ -427,8 +446,9 @@ class SignatureSummaryTemplate:
         return cls(
             params=[
                 ParamSummaryTemplate.from_summary(param, doc_coll)
-                for param in cls.sort_params(summary_node.params)
-                if should_include(param.metadata)],
+                for param in cls.sort_params(
+                    param for param in summary_node.params
+                    if should_include(param.metadata))],
             retval=[
                 RetvalSummaryTemplate.from_summary(
                     summary_node.retval, doc_coll)],
@@ -439,36 +459,45 @@ class SignatureSummaryTemplate:
     @classmethod
     def sort_params(
             cls,
-            members: frozenset[ParamSummary]
+            members: Iterable[ParamSummary]
             ) -> list[ParamSummary]:
         # TODO: this needs to support groupings (probably just for kwarg-only
         # params though)
-        return sorted(members, key=lambda member: member.index)
+        return sorted(members, key=_sort_key_index)
+
+
+_PARAM_STYLE_TABLE = {
+    param_style: f'style="{param_style.value}"'
+    for param_style in ParamStyle}
 
 
 def _transform_param_style(value: ParamStyle) -> str:
-    return f'style="{value.value}"'
+    result = _PARAM_STYLE_TABLE.get(value)
+    if result is None:
+        result = f'style="{value.value}"'
+
+    return result
 
 
 @template(
     html,
-    dedent('''\
-        <docnote-callable-signature-param {content.style} role="listitem" {slot.plugin_attrs}>
-            <docnote-header>
-                <docnote-name obj-type="callable-signature-param-item" role="heading" aria-level="3">
-                    {var.name}
-                </docnote-name>
-                {slot.typespec}
-            </docnote-header>
-            <docnote-callable-signature-param-default>
-                {slot.default}
-            </docnote-callable-signature-param-default>
-            <docnote-notes>
-                {slot.notes}
-            </docnote-notes>
-            <docnote-widgets>{slot.plugin_widgets}</docnote-widgets>
-        </docnote-callable-signature-param>
-        '''),  # noqa: E501
+    '''\
+<docnote-callable-signature-param {content.style} role="listitem" {slot.plugin_attrs}>
+    <docnote-header>
+        <docnote-name obj-type="callable-signature-param-item" role="heading" aria-level="3">
+            {var.name}
+        </docnote-name>
+        {slot.typespec}
+    </docnote-header>
+    <docnote-callable-signature-param-default>
+        {slot.default}
+    </docnote-callable-signature-param-default>
+    <docnote-notes>
+        {slot.notes}
+    </docnote-notes>
+    <docnote-widgets>{slot.plugin_widgets}</docnote-widgets>
+</docnote-callable-signature-param>
+''',  # noqa: E501
     loader=TEMPLATE_LOADER)
 class ParamSummaryTemplate:
     style: Content[ParamStyle] = template_field(FieldConfig(
@@ -487,16 +516,13 @@ class ParamSummaryTemplate:
             summary_node: ParamSummary,
             doc_coll: HtmlDocumentCollection
             ) -> Self:
-        rendered_notes: list[HtmlTemplate | ClcRichtextBlocknodeTemplate] = []
-        for note in summary_node.notes:
-            rendered_notes.extend(
-                templatify_doctext(
-                    note, doc_coll, summary_node.metadata))
+        rendered_notes = _templatify_notes(
+            summary_node.notes, doc_coll, summary_node.metadata)
 
-        rendered_default: list[ValueReprTemplate] = []
-        if summary_node.default is not None:
-            rendered_default.append(
-                ValueReprTemplate(repr(summary_node.default)))
+        if summary_node.default is None:
+            rendered_default = EMPTY_SLOT
+        else:
+            rendered_default = (ValueReprTemplate(repr(summary_node.default)),)
 
         plugin_attrs, plugin_widgets = _apply_plugins(
             doc_coll, ParamSummary, summary_node)
@@ -504,9 +530,9 @@ class ParamSummaryTemplate:
             style=summary_node.style,
             name=summary_node.name,
             default=rendered_default,
-            typespec=[templatify_typespec(summary_node.typespec)]
+            typespec=(templatify_typespec(summary_node.typespec),)
                 if summary_node.typespec is not None
-                else (),
+                else EMPTY_SLOT,
             notes=rendered_notes,
             plugin_attrs=plugin_attrs,
             plugin_widgets=plugin_widgets)
@@ -516,14 +542,14 @@ class ParamSummaryTemplate:
     html,
     # Note: the parent signature is responsible for wrapping this in the retval
     # container tag.
-    dedent('''\
-        <docnote-header>
-            {slot.typespec}
-        </docnote-header>
-        <docnote-notes>
-            {slot.notes}
-        </docnote-notes>
-        '''),
+    '''\
+<docnote-header>
+    {slot.typespec}
+</docnote-header>
+<docnote-notes>
+    {slot.notes}
+</docnote-notes>
+''',
     loader=TEMPLATE_LOADER)
 class RetvalSummaryTemplate:
     typespec: Slot[TypespecTemplate]
@@ -535,26 +561,23 @@ class RetvalSummaryTemplate:
             summary_node: RetvalSummary,
             doc_coll: HtmlDocumentCollection
             ) -> Self:
-        rendered_notes: list[HtmlTemplate | ClcRichtextBlocknodeTemplate] = []
-        for note in summary_node.notes:
-            rendered_notes.extend(
-                templatify_doctext(
-                    note, doc_coll, summary_node.metadata))
+        rendered_notes = _templatify_notes(
+            summary_node.notes, doc_coll, summary_node.metadata)
 
         return cls(
-            typespec=[templatify_typespec(summary_node.typespec)]
+            typespec=(templatify_typespec(summary_node.typespec),)
                 if summary_node.typespec is not None
-                else (),
+                else EMPTY_SLOT,
             notes=rendered_notes)
 
 
 @template(
     html,
-    dedent('''\
-        <docnote-value-repr>
-            {var.reprified_value}
-        </docnote-value-repr>
-        '''),
+    '''\
+<docnote-value-repr>
+    {var.reprified_value}
+</docnote-value-repr>
+''',
     loader=TEMPLATE_LOADER)
 class ValueReprTemplate:
     reprified_value: Var[str]
@@ -568,15 +591,11 @@ type NormalizedTypeTemplate = (
     | NormalizedLiteralTypeTemplate)
 
 
-def _transform_lowercase_bool(value: bool) -> str:
-    if value:
-        return 'true'
-    else:
-        return 'false'
+_LOWERCASE_BOOL_TABLE = {True: 'true', False: 'false'}
 
 
-def _transform_tagspec_key(value: str) -> str:
-    return value.removeprefix('has_')
+def _transform_lowercase_bool(value: bool) -> str:
+    return _LOWERCASE_BOOL_TABLE[bool(value)]
 
 
 @template(
@@ -585,25 +604,25 @@ def _transform_tagspec_key(value: str) -> str:
     loader=TEMPLATE_LOADER)
 class TypespecTagTemplate:
     """Typespec tags are used for eg ``ClassVar[...]``, ``Final[...]``,
-    etc.
+    etc. Note that the key is the tag name (ie, ``classvar``), and not
+    the name of the typespec field (ie, ``has_classvar``).
     """
-    key: Content[str] = template_field(
-        FieldConfig(transformer=_transform_tagspec_key))
+    key: Content[str]
     value: Content[bool] = template_field(
         FieldConfig(transformer=_transform_lowercase_bool))
 
 
 @template(
     html,
-    dedent('''\
-        <docnote-typespec>
-            <docnote-normtype>
-                {slot.normtype}
-            </docnote-normtype>
-            <docnote-tags>
-                {slot.typespec_tags}
-            </docnote-tags>
-        </docnote-typespec>'''),
+    '''\
+<docnote-typespec>
+    <docnote-normtype>
+        {slot.normtype}
+    </docnote-normtype>
+    <docnote-tags>
+        {slot.typespec_tags}
+    </docnote-tags>
+</docnote-typespec>''',
     loader=TEMPLATE_LOADER)
 class TypespecTemplate:
     normtype: Slot[NormalizedTypeTemplate]
@@ -615,12 +634,12 @@ class TypespecTemplate:
     # Note: we're not doing a role of list here, because the child elements
     # may or may not be list items (because they can also be used outside of
     # a union) and therefore there's no way to distinguish between them
-    dedent('''\
-        <docnote-normtype-union-container>
-            <docnote-normtype-union>
-                {slot.normtypes}
-            </docnote-normtype-union>
-        </docnote-normtype-union-container>'''),
+    '''\
+<docnote-normtype-union-container>
+    <docnote-normtype-union>
+        {slot.normtypes}
+    </docnote-normtype-union>
+</docnote-normtype-union-container>''',
     loader=TEMPLATE_LOADER)
 class NormalizedUnionTypeTemplate:
     normtypes: Slot[NormalizedTypeTemplate]
@@ -628,17 +647,17 @@ class NormalizedUnionTypeTemplate:
 
 @template(
     html,
-    dedent('''\
-        <docnote-normtype-concrete>
-            <docnote-normtype-concrete-primary>
-                {slot.primary}
-            </docnote-normtype-concrete-primary>
-            <docnote-normtype-params-container>
-                <docnote-normtype-params>
-                    {slot.params}
-                </docnote-normtype-params>
-            </docnote-normtype-params-container>
-        </docnote-normtype-concrete>'''),
+    '''\
+<docnote-normtype-concrete>
+    <docnote-normtype-concrete-primary>
+        {slot.primary}
+    </docnote-normtype-concrete-primary>
+    <docnote-normtype-params-container>
+        <docnote-normtype-params>
+            {slot.params}
+        </docnote-normtype-params>
+    </docnote-normtype-params-container>
+</docnote-normtype-concrete>''',
     loader=TEMPLATE_LOADER)
 class NormalizedConcreteTypeTemplate:
     primary: Slot[CrossrefSummaryTemplate]
@@ -647,14 +666,14 @@ class NormalizedConcreteTypeTemplate:
 
 @template(
     html,
-    dedent('''\
-        <docnote-normtype-emptygeneric>
-            <docnote-normtype-params-container>
-                <docnote-normtype-params>
-                    {slot.params}
-                </docnote-normtype-params>
-            </docnote-normtype-params-container>
-        </docnote-normtype-emptygeneric>'''),
+    '''\
+<docnote-normtype-emptygeneric>
+    <docnote-normtype-params-container>
+        <docnote-normtype-params>
+            {slot.params}
+        </docnote-normtype-params>
+    </docnote-normtype-params-container>
+</docnote-normtype-emptygeneric>''',
     loader=TEMPLATE_LOADER)
 class NormalizedEmptyGenericTypeTemplate:
     params: Slot[NormalizedTypeTemplate]
@@ -662,10 +681,10 @@ class NormalizedEmptyGenericTypeTemplate:
 
 @template(
     html,
-    dedent('''\
-        <docnote-normtype-specialform>
-            {slot.type_}
-        </docnote-normtype-specialform>'''),
+    '''\
+<docnote-normtype-specialform>
+    {slot.type_}
+</docnote-normtype-specialform>''',
     loader=TEMPLATE_LOADER)
 class NormalizedSpecialTypeTemplate:
     type_: Slot[CrossrefSummaryTemplate]
@@ -676,10 +695,10 @@ class NormalizedSpecialTypeTemplate:
     # Note: we're not doing a role of list here, because the child elements
     # may or may not be list items (because they can also be used outside of
     # a literal) and therefore there's no way to distinguish between them
-    dedent('''\
-        <docnote-normtype-literal>
-            {slot.values}
-        </docnote-normtype-literal>'''),
+    '''\
+<docnote-normtype-literal>
+    {slot.values}
+</docnote-normtype-literal>''',
     loader=TEMPLATE_LOADER)
 class NormalizedLiteralTypeTemplate:
     values: Slot[FallbackContainerTemplate | CrossrefSummaryTemplate]
@@ -687,15 +706,15 @@ class NormalizedLiteralTypeTemplate:
 
 @template(
     html,
-    dedent('''\
-        <abbr title="{var.qualname}{var.traversals}">
-            {slot.crossref_target}
-        </abbr>
-        '''),
-    loader=TEMPLATE_LOADER)
+    '''\
+<abbr title="{var.qualname}">
+    {slot.crossref_target}
+</abbr>
+''',
+    loader=TEMPLATE_LOADER,
+    frozen=True)
 class CrossrefSummaryTemplate:
     qualname: Var[str]
-    traversals: Var[str | None] = field(default=None, kw_only=True)
     crossref_target: Slot[CrossrefLinkTemplate | CrossrefTextTemplate]
 
     @classmethod
@@ -708,20 +727,21 @@ class CrossrefSummaryTemplate:
             shortname = crossref.toplevel_name
             qualname = f'{crossref.module_name}:{crossref.toplevel_name}'
 
-        traversals = (''.join(
-            _flatten_typespec_traversals(crossref.traversals))
-            if crossref.traversals else None)
+        # The traversals are folded into the qualname up front, so that the
+        # title renders from a single variable.
+        has_traversals = bool(crossref.traversals)
+        if has_traversals:
+            qualname += _flatten_typespec_traversals(crossref.traversals)
 
         # TODO: we need to convert the slot to be an environment function
         # operating on the document collection so that linkability can be
         # determined lazily at render time
         return cls(
             qualname=qualname,
-            traversals=traversals,
-            crossref_target=[
+            crossref_target=(
                 CrossrefTextTemplate(
                     shortname=shortname,
-                    has_traversals=traversals is not None)])
+                    has_traversals=has_traversals),))
 
     @classmethod
     def from_summary(
@@ -743,22 +763,23 @@ class CrossrefLinkTemplate:
     target: Var[str]
     text: Slot[CrossrefTextTemplate]
 
-    has_traversals: bool = field(init=False)
 
-    def __post_init__(self):
-        for text_instance in self.text:
-            text_instance.has_traversals = self.has_traversals
+def _transform_has_traversals(value: bool) -> str | None:
+    if value:
+        return '<...>'
+    else:
+        return None
 
 
 @template(
     html,
     '{var.shortname}{content.has_traversals}',
-    loader=TEMPLATE_LOADER)
+    loader=TEMPLATE_LOADER,
+    frozen=True)
 class CrossrefTextTemplate:
     shortname: Var[str]
     has_traversals: Content[bool] = template_field(
-        FieldConfig(
-            transformer=lambda value: '<...>' if value else None))
+        FieldConfig(transformer=_transform_has_traversals))
 
 
 def templatify_doctext(
@@ -771,7 +792,7 @@ def templatify_doctext(
             HtmlGenericElement(
                 tag='code',
                 body=[PlaintextTemplate(doctext.value)],
-                attrs=[HtmlAttr(key='class', value=INLINE_PRE_CLASSNAME)])]
+                attrs=INLINE_PRE_ATTRS)]
 
     if isinstance(doctext.markup_lang, str):
         if doctext.markup_lang in set(MarkupLang.CLEANCOPY.value):
@@ -789,7 +810,21 @@ def templatify_doctext(
         clc_text=doctext.value,
         context=summary_metadata)
     return [ClcRichtextBlocknodeTemplate.from_document(
-        ast_doc, doc_coll=doc_coll)]
+        ast_doc, doc_coll)]
+
+
+def _templatify_notes(
+        notes: Sequence[DocText],
+        doc_coll: HtmlDocumentCollection,
+        summary_metadata: SummaryMetadataProtocol,
+        ) -> Sequence[HtmlTemplate | ClcRichtextBlocknodeTemplate]:
+    if not notes:
+        return EMPTY_SLOT
+
+    return [
+        rendered
+        for note in notes
+        for rendered in templatify_doctext(note, doc_coll, summary_metadata)]
 
 
 def templatify_concrete_typespec(
@@ -809,27 +844,41 @@ def templatify_concrete_typespec(
 def templatify_typespec(
         typespec: TypeSpec
         ) -> TypespecTemplate:
-    tags: list[TypespecTagTemplate] = []
-
-    for dc_field in fields(typespec):
-        if dc_field.name != 'normtype':
-            tags.append(TypespecTagTemplate(
-                key=dc_field.name,
-                value=getattr(typespec, dc_field.name)))
+    typespec_cls = type(typespec)
+    tag_names = _typespec_tag_names.get(typespec_cls)
+    if tag_names is None:
+        tag_names = _typespec_tag_names[typespec_cls] = tuple(
+            (dc_field.name, dc_field.name.removeprefix('has_'))
+            for dc_field in fields(typespec)
+            if dc_field.name != 'normtype')
 
     return TypespecTemplate(
         normtype=[templatify_normalized_type(typespec.normtype)],
-        typespec_tags=tags)
+        typespec_tags=[
+            TypespecTagTemplate(key=tag_key, value=getattr(typespec, name))
+            for name, tag_key in tag_names])
+
+
+# The tag fields are a property of the typespec class, so there's no need to
+# re-inspect the dataclass fields (or re-derive the tag keys) for every
+# single annotation. Values are (field name, tag key).
+_typespec_tag_names: dict[type[TypeSpec], tuple[tuple[str, str], ...]] = {}
 
 
-@singledispatch
 def templatify_normalized_type(
         normtype: NormalizedType
         ) -> NormalizedTypeTemplate:
-    raise TypeError('Unknown normalized type!', normtype)
+    templatifier = _normtype_templatifiers.get(type(normtype))
+    if templatifier is None:
+        templatifier = resolve_by_mro(
+            _normtype_templatifiers, type(normtype), None)
+        if templatifier is None:
+            raise TypeError('Unknown normalized type!', normtype)
+
+    return templatifier(normtype)
 
-@templatify_normalized_type.register
-def _(
+
+def _templatify_union_type(
         normtype: NormalizedUnionType
         ) -> NormalizedUnionTypeTemplate:
     return NormalizedUnionTypeTemplate(
@@ -837,8 +886,8 @@ def _(
             templatify_normalized_type(nested_normtype)
             for nested_normtype in normtype.normtypes])
 
-@templatify_normalized_type.register
-def _(
+
+def _templatify_empty_generic_type(
         normtype: NormalizedEmptyGenericType
         ) -> NormalizedEmptyGenericTypeTemplate:
     return NormalizedEmptyGenericTypeTemplate(
@@ -846,25 +895,48 @@ def _(
             templatify_normalized_type(param_typespec.normtype)
             for param_typespec in normtype.params])
 
-@templatify_normalized_type.register
-def _(
+
+def _templatify_concrete_type(
         normtype: NormalizedConcreteType
         ) -> NormalizedConcreteTypeTemplate:
-    return NormalizedConcreteTypeTemplate(
-        primary=[CrossrefSummaryTemplate.from_crossref(normtype.primary)],
-        params=[
-            templatify_normalized_type(param_typespec.normtype)
-            for param_typespec in normtype.params])
+    if normtype.params:
+        return NormalizedConcreteTypeTemplate(
+            primary=[CrossrefSummaryTemplate.from_crossref(normtype.primary)],
+            params=[
+                templatify_normalized_type(param_typespec.normtype)
+                for param_typespec in normtype.params])
+
+    # Bare types (``int``, ``str``, etc) make up the vast majority of all
+    # annotations, so within a single module, we share a single template
+    # instance between all of them. Note that we deliberately don't cache
+    # anything with params or traversals: those compare by value, and (for
+    # example) ``1`` is equal to ``True``, which would result in rendering
+    # the wrong one. Names are just strings, so they don't have that problem.
+    primary = normtype.primary
+    cache = _concrete_type_cache.get()
+    if cache is None or primary.traversals:
+        return NormalizedConcreteTypeTemplate(
+            primary=[CrossrefSummaryTemplate.from_crossref(primary)],
+            params=EMPTY_SLOT)
+
+    cache_key = (primary.module_name, primary.toplevel_name)
+    result = cache.get(cache_key)
+    if result is None:
+        result = cache[cache_key] = NormalizedConcreteTypeTemplate(
+            primary=[CrossrefSummaryTemplate.from_crossref(primary)],
+            params=EMPTY_SLOT)
+
+    return result
+
 
-@templatify_normalized_type.register
-def _(
+def _templatify_special_type(
         normtype: NormalizedSpecialType
         ) -> NormalizedSpecialTypeTemplate:
     return NormalizedSpecialTypeTemplate(
         type_=[specialform_type_factory(normtype)])
 
-@templatify_normalized_type.register
-def _(
+
+def _templatify_literal_type(
         normtype: NormalizedLiteralType
         ) -> NormalizedLiteralTypeTemplate:
     return NormalizedLiteralTypeTemplate(
@@ -873,6 +945,25 @@ def _(
             for value in normtype.values])
 
 
+# This is only set while templatifying a module (see
+# ``ModuleSummaryTemplate.from_summary``), so that cached templates never
+# outlive the module they were created for. Keys are (module name, toplevel
+# name).
+_concrete_type_cache: ContextVar[
+    dict[tuple[str | None, str | None], NormalizedConcreteTypeTemplate]
+    | None
+] = ContextVar('_concrete_type_cache', default=None)
+_normtype_templatifiers: dict[
+    type, Callable[[typing.Any], NormalizedTypeTemplate]
+] = {
+    NormalizedUnionType: _templatify_union_type,
+    NormalizedEmptyGenericType: _templatify_empty_generic_type,
+    NormalizedConcreteType: _templatify_concrete_type,
+    NormalizedSpecialType: _templatify_special_type,
+    NormalizedLiteralType: _templatify_literal_type,
+}
+
+
 @overload
 def get_template_cls(
         summary: ModuleSummary
@@ -912,26 +1003,39 @@ def get_template_cls(
     namespace; the rest should be known directly based on the structure
     of the summary.
     """
-    if isinstance(summary, ModuleSummary):
-        return ModuleSummaryTemplate
-    elif isinstance(summary, VariableSummary):
-        return VariableSummaryTemplate
-    elif isinstance(summary, ClassSummary):
-        return ClassSummaryTemplate
-    elif isinstance(summary, CallableSummary):
-        return CallableSummaryTemplate
-    elif isinstance(summary, CrossrefSummary):
-        return CrossrefSummaryTemplate
-    else:
-        raise TypeError('Unsupported summary type', summary)
+    template_cls = _summary_template_classes.get(type(summary))
+    if template_cls is None:
+        template_cls = resolve_by_mro(
+            _summary_template_classes, type(summary), None)
+        if template_cls is None:
+            raise TypeError('Unsupported summary type', summary)
+
+    return template_cls
+
+
+_summary_template_classes: dict[
+    type,
+    type[ModuleSummaryTemplate]
+    | type[VariableSummaryTemplate]
+    | type[ClassSummaryTemplate]
+    | type[CallableSummaryTemplate]
+    | type[CrossrefSummaryTemplate]
+] = {
+    ModuleSummary: ModuleSummaryTemplate,
+    VariableSummary: VariableSummaryTemplate,
+    ClassSummary: ClassSummaryTemplate,
+    CallableSummary: CallableSummaryTemplate,
+    CrossrefSummary: CrossrefSummaryTemplate,
+}
 
 
 def should_include(
         metadata: SummaryMetadataProtocol
         ) -> bool:
-    if metadata.extracted_inclusion is True:
+    extracted_inclusion = metadata.extracted_inclusion
+    if extracted_inclusion is True:
         return True
-    if metadata.extracted_inclusion is False:
+    if extracted_inclusion is False:
         return False
 
     return metadata.to_document and not metadata.disowned
@@ -939,91 +1043,100 @@ def should_include(
 
 def _flatten_typespec_traversals(
         traversals: Sequence[CrossrefTraversal],
-        *,
-        _index=0
-        ) -> Iterator[str]:
+        ) -> str:
     """This is a backstop to collapse crossref traversals into a string
     that can be rendered.
     """
-    if len(traversals) <= _index:
-        return
+    parts: list[str] = []
+    for traversal in traversals:
+        renderer = _traversal_renderers.get(type(traversal))
+        if renderer is None:
+            renderer = resolve_by_mro(
+                _traversal_renderers, type(traversal), None)
+            if renderer is None:
+                raise TypeError(
+                    'Invalid traversal type for typespec!', traversal)
 
-    this_traversal = traversals[_index]
+        parts.append(renderer(traversal))
 
-    if isinstance(this_traversal, GetattrTraversal):
-        yield f'.{this_traversal.name}'
+    return ''.join(parts)
 
-    elif isinstance(this_traversal, CallTraversal):
-        yield f'(*{this_traversal.args}, **{this_traversal.kwargs})'
 
-    elif isinstance(this_traversal, GetitemTraversal):
-        yield f'[{this_traversal.key}]'
+def _render_getattr_traversal(traversal: GetattrTraversal) -> str:
+    return f'.{traversal.name}'
 
-    elif isinstance(this_traversal, SyntacticTraversal):
-        yield f'<{this_traversal.type_.value}: {this_traversal.key}>'
 
-    else:
-        raise TypeError('Invalid traversal type for typespec!', this_traversal)
+def _render_call_traversal(traversal: CallTraversal) -> str:
+    return f'(*{traversal.args}, **{traversal.kwargs})'
+
+
+def _render_getitem_traversal(traversal: GetitemTraversal) -> str:
+    return f'[{traversal.key}]'
+
 
-    yield from _flatten_typespec_traversals(traversals, _index=_index + 1)
+def _render_syntactic_traversal(traversal: SyntacticTraversal) -> str:
+    return f'<{traversal.type_.value}: {traversal.key}>'
+
+
+_traversal_renderers: dict[type, Callable[[typing.Any], str]] = {
+    GetattrTraversal: _render_getattr_traversal,
+    CallTraversal: _render_call_traversal,
+    GetitemTraversal: _render_getitem_traversal,
+    SyntacticTraversal: _render_syntactic_traversal,
+}
 
 
 def dunder_all_factory(
         names: Sequence[str],
         ) -> list[HtmlGenericElement]:
-    retval: list[HtmlGenericElement] = []
-    for name in names:
-        retval.append(HtmlGenericElement(
-            tag='li',
-            body=[PlaintextTemplate(name)]))
-
-    return retval
+    return [
+        HtmlGenericElement(tag='li', body=[PlaintextTemplate(name)])
+        for name in names]
 
 
 _specialform_lookup: dict[NormalizedSpecialType, CrossrefSummaryTemplate] = {
     NormalizedSpecialType.ANY: CrossrefSummaryTemplate(
             qualname='typing.Any',
-            crossref_target=[
+            crossref_target=(
                 CrossrefTextTemplate(
                     shortname='Any',
-                    has_traversals=False)]),
+                    has_traversals=False),)),
     NormalizedSpecialType.LITERAL_STRING: CrossrefSummaryTemplate(
             qualname='typing.LiteralString',
-            crossref_target=[
+            crossref_target=(
                 CrossrefTextTemplate(
                     shortname='LiteralString',
-                    has_traversals=False)]),
+                    has_traversals=False),)),
     NormalizedSpecialType.NEVER: CrossrefSummaryTemplate(
             qualname='typing.Never',
-            crossref_target=[
+            crossref_target=(
                 CrossrefTextTemplate(
                     shortname='Never',
-                    has_traversals=False)]),
+                    has_traversals=False),)),
     NormalizedSpecialType.NORETURN: CrossrefSummaryTemplate(
             qualname='typing.NoReturn',
-            crossref_target=[
+            crossref_target=(
                 CrossrefTextTemplate(
                     shortname='NoReturn',
-                    has_traversals=False)]),
+                    has_traversals=False),)),
     NormalizedSpecialType.SELF: CrossrefSummaryTemplate(
             qualname='typing.Self',
-            crossref_target=[
+            crossref_target=(
                 CrossrefTextTemplate(
                     shortname='Self',
-                    has_traversals=False)]),
+                    has_traversals=False),)),
     NormalizedSpecialType.NONE: CrossrefSummaryTemplate(
             qualname='builtins.None',
-            crossref_target=[
+            crossref_target=(
                 CrossrefTextTemplate(
                     shortname='None',
-                    has_traversals=False)]),
+                    has_traversals=False),)),
 }
 
 
-def specialform_type_factory(
-        normtype: NormalizedSpecialType
-        ) -> CrossrefSummaryTemplate:
-    return _specialform_lookup[normtype]
+# Note that the templates themselves are shared between all special types;
+# this is safe because the crossref templates are frozen.
+specialform_type_factory = _specialform_lookup.__getitem__
 
 
 def literal_value_factory(
@@ -1048,6 +1161,16 @@ def literal_value_factory(
 
         return CrossrefSummaryTemplate.from_crossref(value)
 
+    # Note that the type is part of the cache key because otherwise, eg,
+    # ``1`` and ``True`` would share a template (since they're equal)
+    return _templatify_literal_value(type(value), value)
+
+
+@lru_cache(maxsize=512)
+def _templatify_literal_value(
+        value_type: type,
+        value: int | bool | str | bytes
+        ) -> FallbackContainerTemplate:
     return FallbackContainerTemplate(
         wraps=[formatting_factory(
             spectype=InlineFormatting.PRE,
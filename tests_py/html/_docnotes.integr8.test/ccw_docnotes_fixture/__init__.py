@@ -0,0 +1,85 @@
+"""This is a small fixture package for the docnotes rendering tests. It
+exists purely to exercise as many of the docnotes templates as possible.
+"""
+from collections.abc import AsyncIterator
+from collections.abc import Iterator
+from typing import Annotated
+from typing import ClassVar
+from typing import Final
+from typing import Literal
+
+from ccw_docnotes_fixture_ext import Shape
+from docnote import Note
+
+__all__ = [
+    'CONSTANT',
+    'Outer',
+    'agen',
+    'coro',
+    'gen',
+    'plain',
+    'uses_traversal',
+    'variadic',
+]
+
+CONSTANT: Final[int] = 42
+
+
+class Outer:
+    """A class with a nested class, methods of every type, and a
+    class variable.
+    """
+    counter: ClassVar[int] = 0
+    name: Annotated[str, Note('The name of the thing.')]
+
+    class Inner:
+        """A nested class."""
+
+    def instance_method(self, value: int) -> str:
+        """An instance method."""
+        return str(value)
+
+    @classmethod
+    def class_method(cls) -> None:
+        """A classmethod."""
+
+    @staticmethod
+    def static_method(pos_only: int, /, *, kw_only: bool = False) -> bool:
+        """A staticmethod with positional-only and keyword-only
+        params.
+        """
+        return kw_only
+
+
+def plain(
+        value: int,
+        mode: Literal['a'] = 'a'
+        ) -> list[str]:
+    """A plain sync function."""
+    return []
+
+
+def variadic(*args: int, **kwargs: str) -> None:
+    """A function with variadic params."""
+
+
+async def coro() -> int:
+    """A plain coroutine function."""
+    return 1
+
+
+def gen() -> Iterator[int]:
+    """A sync generator."""
+    yield 1
+
+
+async def agen() -> AsyncIterator[int]:
+    """An async generator."""
+    yield 1
+
+
+def uses_traversal(corner: Shape.Corner) -> Shape.Corner:
+    """Annotated with a class nested inside an imported one, which
+    results in a crossref with a traversal.
+    """
+    return corner
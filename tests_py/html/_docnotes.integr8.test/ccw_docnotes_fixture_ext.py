@@ -0,0 +1,11 @@
+"""Defines a class that the fixture package only ever references through
+one of its attributes. This module is deliberately not extracted itself,
+which gives us a crossref with a traversal.
+"""
+
+
+class Shape:
+    """A class with a nested class."""
+
+    class Corner:
+        """Referenced from the package root."""
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from docnote_extract import gather
+from templatey.environments import RenderEnvironment
+from templatey.prebaked.loaders import InlineStringTemplateLoader
+
+from cleancopywriter.html.documents import DocnoteHtmlDocument
+from cleancopywriter.html.documents import HtmlDocumentCollection
+
+fixture_dir = Path(__file__).parent / '_docnotes.integr8.test'
+FIXTURE_PKG = 'ccw_docnotes_fixture'
+# The fixture package only references this module through attributes of
+# its classes, so stubbing it gives us crossrefs with traversals.
+FIXTURE_EXT_MODULE = 'ccw_docnotes_fixture_ext'
+
+
+class TestDocnotesRendering:
+
+    def test_fixture_package_renders(self, monkeypatch: pytest.MonkeyPatch):
+        """Rendering the fixture package must exactly match the expected
+        HTML. The fixture covers method types, call colors, generator
+        flags, param styles, typespec tags, and crossrefs with
+        traversals.
+
+        Note that the fixture deliberately avoids unions and multi-value
+        literals, since their members are unordered, which would make the
+        rendered output depend upon the hash seed.
+        """
+        monkeypatch.syspath_prepend(str(fixture_dir))
+        docnotes = gather(
+            [FIXTURE_PKG], enabled_stubs=frozenset({FIXTURE_EXT_MODULE}))
+        doc_coll = HtmlDocumentCollection(target_resolver=lambda target: '#')
+        for summary_tree_node in docnotes.summaries[FIXTURE_PKG].flatten():
+            if summary_tree_node.to_document:
+                doc_coll.add(
+                    summary_tree_node.module_summary.name,
+                    docnote_src=summary_tree_node)
+
+        doc = doc_coll[FIXTURE_PKG]
+        assert isinstance(doc, DocnoteHtmlDocument)
+
+        render_env = RenderEnvironment(InlineStringTemplateLoader())
+        result = render_env.render_sync(doc.intermediate_representation)
+
+        assert result == (fixture_dir / f'{FIXTURE_PKG}.html').read_text(
+            'utf-8')
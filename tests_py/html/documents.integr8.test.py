@@ -10,7 +10,11 @@ from cleancopy.ast import ASTNode
 from cleancopy.ast import EmbeddingBlockNode
 from cleancopy.ast import RichtextBlockNode
 from cleancopy.ast import RichtextInlineNode
+from templatey.environments import RenderEnvironment
+from templatey.prebaked.loaders import InlineStringTemplateLoader
 
+from cleancopywriter.html.documents import PARSE_CACHE_MAXSIZE
+from cleancopywriter.html.documents import HtmlDocumentCollection
 from cleancopywriter.html.documents import quickrender
 from cleancopywriter.html.generic_templates import HtmlAttr
 from cleancopywriter.html.generic_templates import PlaintextTemplate
@@ -134,3 +138,94 @@ class TestHtmlWriter:
                 clc_plugins=[FakeClcPlugin()]))
 
         assert result == tvec.expected_render_result
+
+
+class TestHtmlDocumentCollection:
+
+    def test_add_prerenders(self):
+        """When the collection has a render environment, adding a
+        document must also render it, with the same result as rendering
+        it directly.
+        """
+        clc_text = '> Hello\n    **world**\n'
+        doc_coll = HtmlDocumentCollection(
+            target_resolver=lambda target: '#',
+            render_env=RenderEnvironment(InlineStringTemplateLoader()))
+
+        doc_coll.add('foo', clc_src=doc_coll.preprocess(clc_text=clc_text))
+
+        assert doc_coll['foo'].prerendered_html == quickrender(clc_text)
+
+    def test_add_without_render_env(self):
+        """When the collection has no render environment, adding a
+        document must not render it.
+        """
+        clc_text = '> Hello\n    **world**\n'
+        doc_coll = HtmlDocumentCollection(target_resolver=lambda target: '#')
+
+        doc_coll.add('foo', clc_src=doc_coll.preprocess(clc_text=clc_text))
+
+        assert doc_coll['foo'].prerendered_html is None
+
+    def test_documents_view_tracks_adds(self):
+        """The ``documents`` view must be reused between accesses, but
+        must reflect any documents added since it was last built.
+        """
+        doc_coll = HtmlDocumentCollection(target_resolver=lambda target: '#')
+        doc_coll.add('foo', clc_src=doc_coll.preprocess(clc_text='foo'))
+        first_view = doc_coll.documents
+
+        assert first_view == ('foo',)
+        assert doc_coll.documents is first_view
+
+        doc_coll.add('bar', clc_src=doc_coll.preprocess(clc_text='bar'))
+
+        assert doc_coll.documents == ('foo', 'bar')
+
+    def test_parse_cache_reuses_documents(self):
+        """With parse caching enabled, preprocessing the same source
+        twice must reuse the parsed document, regardless of whether the
+        source was passed as str or bytes.
+        """
+        doc_coll = HtmlDocumentCollection(
+            target_resolver=lambda target: '#',
+            cache_parsed_documents=True)
+
+        first = doc_coll.preprocess(clc_text='> Hello\n    world\n')
+        second = doc_coll.preprocess(clc_text=b'> Hello\n    world\n')
+        other = doc_coll.preprocess(clc_text='> Hello\n    there\n')
+
+        assert first is second
+        assert other is not first
+
+    def test_parse_cache_evicts_least_recently_used(self):
+        """Once the parse cache is full, preprocessing a new source must
+        evict the least recently used document, but keep any that were
+        used more recently.
+        """
+        doc_coll = HtmlDocumentCollection(
+            target_resolver=lambda target: '#',
+            cache_parsed_documents=True)
+
+        first = doc_coll.preprocess(clc_text='first')
+        second = doc_coll.preprocess(clc_text='second')
+        for index in range(PARSE_CACHE_MAXSIZE - 2):
+            doc_coll.preprocess(clc_text=f'filler {index}')
+        # Touching this makes ``second`` the least recently used, even
+        # though ``first`` was added earlier.
+        doc_coll.preprocess(clc_text='first')
+        doc_coll.preprocess(clc_text='overflow')
+
+        assert doc_coll.preprocess(clc_text='first') is first
+        assert doc_coll.preprocess(clc_text='second') is not second
+
+    def test_parse_cache_disabled_by_default(self):
+        """Without parse caching, each preprocessing call must result in
+        a separately parsed document.
+        """
+        doc_coll = HtmlDocumentCollection(target_resolver=lambda target: '#')
+
+        first = doc_coll.preprocess(clc_text='> Hello\n    world\n')
+        second = doc_coll.preprocess(clc_text='> Hello\n    world\n')
+
+        assert first is not second